@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Response, Form, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 from ..core.config import settings
+from ..core.executors import ExecutorSaturated, auth_db_executor, hash_executor
 from ..core.security import (
     create_access_token,
     create_refresh_token,
@@ -12,7 +13,7 @@ from ..core.security import (
 from ..models.token import Token
 from ..models.user import User, UserCreate, UserDB
 from ..services.user_service import get_user_by_email, create_user
-from ..services.audit_service import create_login_history
+from ..services.audit_service import login_history_writer
 
 router = APIRouter()
 
@@ -21,9 +22,22 @@ from sqlalchemy.orm import Session
 
 from ..core.database import get_db
 
+
+async def run_auth_job(executor, fn, *args, **kwargs):
+    """Run blocking auth work on a bounded pool, shedding load with a 503 when it is full"""
+    try:
+        return await executor.run(fn, *args, **kwargs)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
 @router.post("/login", response_model=Token)
 async def login_for_access_token(request: Request, response: Response, db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends(), role: str = Form(...)):
-    user = get_user_by_email(db, form_data.username)
+    user = await run_auth_job(auth_db_executor, get_user_by_email, db, form_data.username)
     if not user or user.deleted_at:
         raise HTTPException(
             status_code=401,
@@ -31,13 +45,12 @@ async def login_for_access_token(request: Request, response: Response, db: Sessi
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(form_data.password, user.password_hash):
+    if not await run_auth_job(hash_executor, verify_password, form_data.password, user.password_hash):
         raise HTTPException(
             status_code=401,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    print("hello")
     # The role check is implicitly handled by the frontend sending the role,
     # but the authoritative role is taken from the database.
     # We can add an explicit check if desired:
@@ -66,7 +79,7 @@ async def login_for_access_token(request: Request, response: Response, db: Sessi
         samesite="lax",
     )
 
-    # create_login_history(db, user.id, request.client.host)
+    login_history_writer.enqueue(user.id, request.client.host if request.client else None)
 
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
@@ -79,11 +92,11 @@ async def logout(response: Response):
 
 @router.post("/signup", response_model=User)
 async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user_by_email(db, email=user_data.email)
+    db_user = await run_auth_job(auth_db_executor, get_user_by_email, db, email=user_data.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await run_auth_job(hash_executor, get_password_hash, user_data.password)
     
     # Create a new user dictionary with the hashed password and default role
     new_user_data = user_data.dict()
@@ -93,4 +106,4 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 
     # The create_user service needs to be adapted to accept this dictionary
     # For now, let's assume it does. If not, we'll adjust the service.
-    return create_user(db=db, user_data=new_user_data)
+    return await run_auth_job(auth_db_executor, create_user, db=db, user_data=new_user_data)
@@ -1,94 +1,271 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
 
-from ..core.database import get_db
+from ..core.database import get_async_db
+from ..core.etag import EQUIPMENT_TABLES, conditional_get
+from ..core.pagination import decode_cursor, encode_cursor, estimate_row_count
+from ..core.projection import FieldSet
 from ..core.security import require_role
+from ..core.serialization import ORJSONResponse
+from ..models.equipment import BulkEquipmentUpdate
+from ..services.change_feed import CHANGE_EVENT_MAX_IDS, publish_change
+from ..services.equipment_index import equipment_index
+from ..services.import_service import (
+    ImportSpec,
+    collect_staging_errors,
+    date_field,
+    int_field,
+    stage_import,
+    text_field,
+)
+from ..services.request_service import status_transition_sql
+from ..services.sync_service import fetch_changes
 
 router = APIRouter()
 
 
 # ==================== GET Equipment List ====================
+EQUIPMENT_FIELDS = FieldSet({
+    "id": "e.id",
+    "name": "e.name",
+    "serialNumber": "e.serial_number",
+    "category": "e.category",
+    "purchaseDate": "e.purchase_date",
+    "warrantyExpiry": "e.warranty_expiry",
+    "location": "e.location",
+    "department": "e.department",
+    "isScrapped": "e.is_scrapped",
+    "maintenanceTeamId": "e.maintenance_team_id",
+    "teamName": "mt.name as team_name",
+    "defaultTechnicianId": "e.default_technician_id",
+    "technicianName": "u.name as technician_name",
+    "createdAt": "e.created_at",
+    "updatedAt": "e.updated_at",
+}, source="equipment e", joins={
+    "mt": "LEFT JOIN maintenanceteam mt ON e.maintenance_team_id = mt.id",
+    "u": 'LEFT JOIN "User" u ON e.default_technician_id = u.id',
+})
+
+
+# Whitelisted sort keys; nullable columns are coalesced so (key, id) keyset
+# comparisons never meet NULL. Each has a matching partial index.
+EQUIPMENT_SORT_KEYS = {
+    "created_at": ("e.created_at", datetime.fromisoformat),
+    "name": ("e.name", str),
+    "serial": ("e.serial_number", str),
+    "warranty_expiry": ("COALESCE(e.warranty_expiry, DATE '9999-12-31')", date.fromisoformat),
+    "department": ("COALESCE(e.department, '')", str),
+}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 @router.get("/equipment")
-def get_equipment_list(
+async def get_equipment_list(
+    request: Request,
     category: Optional[str] = None,
     department: Optional[str] = None,
     is_scrapped: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
+    warranty_expiring_within: Optional[int] = Query(None, ge=0, le=3650),
+    sort: str = Query("-created_at", pattern="^-?(created_at|name|serial|warranty_expiry|department)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    with_total: Optional[str] = Query(None, pattern="^(exact|estimated)$"),
+    updated_since: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get list of all equipment with optional filters"""
+    """
+    Get a page of equipment with optional filters.
+    q matches a name or serial number prefix (case-insensitive);
+    warranty_expiring_within=N keeps equipment whose warranty ends in the next N days.
+    sort is one of created_at, name, serial, warranty_expiry, department, prefixed
+    with - for descending. Pages are keyed on (sort key, id); pass nextCursor back
+    as cursor with the same sort. with_total=exact|estimated adds a total count.
+    
+    With updated_since the endpoint returns changes instead, limit rows per page:
+    equipment created or updated since the token, tombstones for deleted ones, and
+    a new watermark. Start with updated_since=0 and pass the watermark back while
+    hasMore is true.
+    
+    fields=id,name,... returns only those fields; format=columnar returns one
+    array per field instead of one object per equipment.
+    """
     
-    query = """
-        SELECT 
-            e.id,
-            e.name,
-            e.serial_number,
-            e.category,
-            e.purchase_date,
-            e.warranty_expiry,
-            e.location,
-            e.department,
-            e.is_scrapped,
-            e.maintenance_team_id,
-            e.default_technician_id,
-            e.created_at,
-            e.updated_at,
-            mt.name as team_name,
-            u.name as technician_name
-        FROM equipment e
-        LEFT JOIN maintenanceteam mt ON e.maintenance_team_id = mt.id
-        LEFT JOIN "User" u ON e.default_technician_id = u.id
+    names = EQUIPMENT_FIELDS.parse(fields)
+    columns = EQUIPMENT_FIELDS.select(names, required=("id",))
+    source = EQUIPMENT_FIELDS.from_clause(names, required=("id",))
+    
+    if updated_since is not None:
+        if category or department or is_scrapped is not None or q or warranty_expiring_within is not None or cursor or with_total:
+            raise HTTPException(status_code=400, detail="updated_since cannot be combined with filters or paging")
+        rows, deleted, watermark, has_more = await fetch_changes(
+            db, columns, source, "e", updated_since, limit
+        )
+        return ORJSONResponse({
+            "equipment": EQUIPMENT_FIELDS.render(rows, names, format),
+            "deleted": deleted,
+            "watermark": watermark,
+            "hasMore": has_more,
+        })
+    
+    cache_headers, not_modified = await conditional_get(request, db, EQUIPMENT_TABLES)
+    if not_modified:
+        return not_modified
+    
+    from_clause = source + """
         WHERE e.deleted_at IS NULL
     """
     
     params = {}
     
     if category:
-        query += " AND e.category = :category"
+        from_clause += " AND e.category = :category"
         params["category"] = category
     
     if department:
-        query += " AND e.department = :department"
+        from_clause += " AND e.department = :department"
         params["department"] = department
     
     if is_scrapped is not None:
-        query += " AND e.is_scrapped = :is_scrapped"
+        from_clause += " AND e.is_scrapped = :is_scrapped"
         params["is_scrapped"] = is_scrapped
     
-    query += " ORDER BY e.created_at DESC"
-    
-    result = db.execute(text(query), params)
-    equipment_list = []
-    
-    for row in result:
-        equipment_list.append({
-            "id": row.id,
-            "name": row.name,
-            "serialNumber": row.serial_number,
-            "category": row.category,
-            "purchaseDate": row.purchase_date.isoformat() if row.purchase_date else None,
-            "warrantyExpiry": row.warranty_expiry.isoformat() if row.warranty_expiry else None,
-            "location": row.location,
-            "department": row.department,
-            "isScrapped": row.is_scrapped,
-            "maintenanceTeamId": row.maintenance_team_id,
-            "teamName": row.team_name,
-            "defaultTechnicianId": row.default_technician_id,
-            "technicianName": row.technician_name,
-            "createdAt": row.created_at.isoformat() if row.created_at else None,
-            "updatedAt": row.updated_at.isoformat() if row.updated_at else None,
-        })
+    if q:
+        # Matches the lower(...) text_pattern_ops indexes
+        from_clause += " AND (lower(e.name) LIKE :prefix OR lower(e.serial_number) LIKE :prefix)"
+        params["prefix"] = _escape_like(q.lower()) + "%"
+    
+    if warranty_expiring_within is not None:
+        from_clause += """ AND COALESCE(e.warranty_expiry, DATE '9999-12-31')
+            BETWEEN CURRENT_DATE AND CURRENT_DATE + CAST(:warranty_days AS INTEGER)"""
+        params["warranty_days"] = warranty_expiring_within
+    
+    descending = sort.startswith("-")
+    sort_expression, parse_key = EQUIPMENT_SORT_KEYS[sort.lstrip("-")]
+    direction = "DESC" if descending else "ASC"
+    
+    page_clause = from_clause
+    page_params = dict(params, limit=limit + 1)
+    
+    if cursor:
+        cursor_key, cursor_id = decode_cursor(cursor, 2)
+        try:
+            page_params["cursor_key"] = parse_key(cursor_key)
+            page_params["cursor_id"] = int(cursor_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page_clause += f" AND ({sort_expression}, e.id) {'<' if descending else '>'} (:cursor_key, :cursor_id)"
+    
+    query = f"""
+        SELECT {columns},
+            {sort_expression} as sort_key
+        {page_clause}
+        ORDER BY {sort_expression} {direction}, e.id {direction}
+        LIMIT :limit
+    """
     
-    return {"equipment": equipment_list, "total": len(equipment_list)}
+    rows = (await db.execute(text(query), page_params)).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    total = None
+    if with_total == "exact":
+        total = (await db.execute(text(f"SELECT COUNT(*) {from_clause}"), params)).scalar()
+    elif with_total == "estimated":
+        total = await estimate_row_count(db, f"SELECT 1 {from_clause}", params)
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.sort_key, last.id)
+    
+    return ORJSONResponse({
+        "equipment": EQUIPMENT_FIELDS.render(rows, names, format),
+        "total": total,
+        "nextCursor": next_cursor,
+    }, headers=cache_headers)
+
+
+# ==================== Equipment Lookup ====================
+@router.get("/equipment/lookup")
+async def lookup_equipment(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    fuzzy: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Autocomplete equipment by name or serial number: prefix matches first, then
+    (with fuzzy) trigram matches ranked by similarity, for typos and inner words.
+    """
+    
+    matches = equipment_index.lookup(q, limit)
+    if matches is not None and (len(matches) >= limit or not fuzzy):
+        return ORJSONResponse({"results": matches})
+    
+    fuzzy_clause = """
+            OR :q <% lower(name) OR :q <% lower(serial_number)""" if fuzzy else ""
+    
+    query = text(f"""
+        SELECT 
+            id,
+            name,
+            serial_number,
+            category,
+            location,
+            is_scrapped,
+            (lower(name) LIKE :prefix OR lower(serial_number) LIKE :prefix) as is_prefix,
+            GREATEST(word_similarity(:q, lower(name)), word_similarity(:q, lower(serial_number))) as score
+        FROM equipment
+        WHERE deleted_at IS NULL
+          AND (lower(name) LIKE :prefix OR lower(serial_number) LIKE :prefix{fuzzy_clause})
+        ORDER BY is_prefix DESC, score DESC, name ASC, id ASC
+        LIMIT :limit
+    """)
+    
+    rows = (await db.execute(query, {
+        "q": q.lower(),
+        "prefix": _escape_like(q.lower()) + "%",
+        "limit": limit,
+    })).fetchall()
+    
+    return ORJSONResponse({
+        "results": [
+            {
+                "id": row.id,
+                "name": row.name,
+                "serialNumber": row.serial_number,
+                "category": row.category,
+                "location": row.location,
+                "isScrapped": row.is_scrapped,
+                "match": "prefix" if row.is_prefix else "fuzzy",
+            }
+            for row in rows
+        ]
+    })
 
 
 # ==================== GET Single Equipment ====================
 @router.get("/equipment/{equipment_id}")
-def get_equipment(equipment_id: int, db: Session = Depends(get_db)):
+async def get_equipment(
+    equipment_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get detailed information about a single equipment"""
     
+    cache_headers, not_modified = await conditional_get(request, db, EQUIPMENT_TABLES + ("maintenancerequest",))
+    if not_modified:
+        return not_modified
+    
     query = text("""
         SELECT 
             e.*,
@@ -102,7 +279,7 @@ def get_equipment(equipment_id: int, db: Session = Depends(get_db)):
         WHERE e.id = :equipment_id AND e.deleted_at IS NULL
     """)
     
-    result = db.execute(query, {"equipment_id": equipment_id}).fetchone()
+    result = (await db.execute(query, {"equipment_id": equipment_id})).fetchone()
     
     if not result:
         raise HTTPException(status_code=404, detail="Equipment not found")
@@ -122,15 +299,15 @@ def get_equipment(equipment_id: int, db: Session = Depends(get_db)):
         LIMIT 5
     """)
     
-    recent_requests = db.execute(requests_query, {"equipment_id": equipment_id}).fetchall()
+    recent_requests = (await db.execute(requests_query, {"equipment_id": equipment_id})).fetchall()
     
-    return {
+    return ORJSONResponse({
         "id": result.id,
         "name": result.name,
         "serialNumber": result.serial_number,
         "category": result.category,
-        "purchaseDate": result.purchase_date.isoformat() if result.purchase_date else None,
-        "warrantyExpiry": result.warranty_expiry.isoformat() if result.warranty_expiry else None,
+        "purchaseDate": result.purchase_date,
+        "warrantyExpiry": result.warranty_expiry,
         "location": result.location,
         "department": result.department,
         "isScrapped": result.is_scrapped,
@@ -140,42 +317,42 @@ def get_equipment(equipment_id: int, db: Session = Depends(get_db)):
         "defaultTechnicianId": result.default_technician_id,
         "technicianName": result.technician_name,
         "technicianEmail": result.technician_email,
-        "createdAt": result.created_at.isoformat() if result.created_at else None,
-        "updatedAt": result.updated_at.isoformat() if result.updated_at else None,
+        "createdAt": result.created_at,
+        "updatedAt": result.updated_at,
         "recentRequests": [
             {
                 "id": req.id,
                 "subject": req.subject,
                 "status": req.status,
                 "requestType": req.request_type,
-                "scheduledDate": req.scheduled_date.isoformat() if req.scheduled_date else None,
-                "createdAt": req.created_at.isoformat() if req.created_at else None,
+                "scheduledDate": req.scheduled_date,
+                "createdAt": req.created_at,
             }
             for req in recent_requests
         ]
-    }
+    }, headers=cache_headers)
 
 
 # ==================== CREATE Equipment ====================
 @router.post("/equipment")
-def create_equipment(
+async def create_equipment(
     name: str,
     serial_number: str,
     category: Optional[str] = None,
-    purchase_date: Optional[str] = None,
-    warranty_expiry: Optional[str] = None,
+    purchase_date: Optional[date] = None,
+    warranty_expiry: Optional[date] = None,
     location: Optional[str] = None,
     department: Optional[str] = None,
     maintenance_team_id: Optional[int] = None,
     default_technician_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager"]))
 ):
     """Create new equipment (Admin/Manager only)"""
     
     # Check if serial number already exists
     check_query = text('SELECT id FROM equipment WHERE serial_number = :serial_number')
-    existing = db.execute(check_query, {"serial_number": serial_number}).fetchone()
+    existing = (await db.execute(check_query, {"serial_number": serial_number})).fetchone()
     
     if existing:
         raise HTTPException(status_code=400, detail="Serial number already exists")
@@ -192,7 +369,7 @@ def create_equipment(
         ) RETURNING id
     """)
     
-    result = db.execute(insert_query, {
+    result = await db.execute(insert_query, {
         "name": name,
         "serial_number": serial_number,
         "category": category,
@@ -204,26 +381,116 @@ def create_equipment(
         "default_technician_id": default_technician_id,
     })
     
-    db.commit()
+    await db.commit()
     equipment_id = result.fetchone()[0]
     
     return {"id": equipment_id, "message": "Equipment created successfully"}
 
 
+# ==================== IMPORT Equipment ====================
+EQUIPMENT_IMPORT = ImportSpec("equipment_import", [
+    ("name", "VARCHAR(150)", text_field(150, required=True)),
+    ("serial_number", "VARCHAR(100)", text_field(100, required=True)),
+    ("category", "VARCHAR(100)", text_field(100)),
+    ("purchase_date", "DATE", date_field()),
+    ("warranty_expiry", "DATE", date_field()),
+    ("location", "VARCHAR(150)", text_field(150)),
+    ("department", "VARCHAR(100)", text_field(100)),
+    ("maintenance_team_id", "INTEGER", int_field()),
+    ("default_technician_id", "INTEGER", int_field()),
+])
+
+
+@router.post("/equipment/import")
+async def import_equipment(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role(["admin", "manager"]))
+):
+    """
+    Bulk-create equipment from a streamed CSV (header row) or NDJSON body (Admin/Manager only).
+    Rows are validated as they arrive and COPYed into a staging table, then merged in
+    one statement; rows that fail are reported per line without aborting the file.
+    """
+    
+    report = await stage_import(db, request, format, EQUIPMENT_IMPORT)
+    
+    # One set-based pass flags in-file duplicates, existing serial numbers and unknown references
+    await db.execute(text("""
+        UPDATE equipment_import s
+        SET error = checks.error
+        FROM (
+            SELECT 
+                st.line_no,
+                CASE
+                    WHEN st.line_no <> firsts.first_line
+                        THEN 'Duplicate serial number in file (first on line ' || firsts.first_line || ')'
+                    WHEN e.id IS NOT NULL THEN 'Serial number already exists'
+                    WHEN st.maintenance_team_id IS NOT NULL AND mt.id IS NULL THEN 'Maintenance team not found'
+                    WHEN st.default_technician_id IS NOT NULL AND u.id IS NULL THEN 'Technician not found'
+                END as error
+            FROM equipment_import st
+            JOIN (
+                SELECT serial_number, MIN(line_no) as first_line
+                FROM equipment_import
+                GROUP BY serial_number
+            ) firsts ON firsts.serial_number = st.serial_number
+            LEFT JOIN equipment e ON e.serial_number = st.serial_number
+            LEFT JOIN maintenanceteam mt ON mt.id = st.maintenance_team_id AND mt.deleted_at IS NULL
+            LEFT JOIN "User" u ON u.id = st.default_technician_id AND u.deleted_at IS NULL
+        ) checks
+        WHERE checks.line_no = s.line_no AND checks.error IS NOT NULL
+    """))
+    
+    # Serial numbers created concurrently since the check are skipped and flagged, not fatal
+    await db.execute(text("""
+        WITH inserted AS (
+            INSERT INTO equipment (
+                name, serial_number, category, purchase_date, warranty_expiry,
+                location, department, maintenance_team_id, default_technician_id,
+                created_at, updated_at
+            )
+            SELECT 
+                name, serial_number, category, purchase_date, warranty_expiry,
+                location, department, maintenance_team_id, default_technician_id,
+                NOW(), NOW()
+            FROM equipment_import
+            WHERE error IS NULL
+            ORDER BY line_no
+            ON CONFLICT (serial_number) DO NOTHING
+            RETURNING serial_number
+        )
+        UPDATE equipment_import s
+        SET error = 'Serial number already exists'
+        WHERE s.error IS NULL
+          AND NOT EXISTS (SELECT 1 FROM inserted i WHERE i.serial_number = s.serial_number)
+    """))
+    
+    inserted = (await db.execute(text(
+        "SELECT COUNT(*) FROM equipment_import WHERE error IS NULL"
+    ))).scalar()
+    await collect_staging_errors(db, EQUIPMENT_IMPORT, report)
+    
+    await db.commit()
+    
+    return report.to_dict(inserted)
+
+
 # ==================== UPDATE Equipment ====================
 @router.put("/equipment/{equipment_id}")
-def update_equipment(
+async def update_equipment(
     equipment_id: int,
     name: Optional[str] = None,
     category: Optional[str] = None,
-    purchase_date: Optional[str] = None,
-    warranty_expiry: Optional[str] = None,
+    purchase_date: Optional[date] = None,
+    warranty_expiry: Optional[date] = None,
     location: Optional[str] = None,
     department: Optional[str] = None,
     maintenance_team_id: Optional[int] = None,
     default_technician_id: Optional[int] = None,
     is_scrapped: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager"]))
 ):
     """Update equipment (Admin/Manager only)"""
@@ -280,8 +547,8 @@ def update_equipment(
         RETURNING id
     """)
     
-    result = db.execute(update_query, params)
-    db.commit()
+    result = await db.execute(update_query, params)
+    await db.commit()
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Equipment not found")
@@ -289,11 +556,103 @@ def update_equipment(
     return {"message": "Equipment updated successfully"}
 
 
+# ==================== BULK UPDATE Equipment ====================
+@router.patch("/equipment:bulk")
+async def bulk_update_equipment(
+    payload: BulkEquipmentUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role(["admin", "manager"]))
+):
+    """
+    Apply the same changes to many equipment items in one statement, selected by
+    an explicit ids list or a filter (exactly one). With close_open_requests their
+    new/in-progress requests move to scrap and are logged, as when scrapping by hand.
+    Returns the updated equipment ids and the closed request ids.
+    """
+    
+    if (payload.ids is None) == (payload.filter is None):
+        raise HTTPException(status_code=400, detail="Provide either ids or filter")
+    
+    changes = payload.changes.model_dump(exclude_none=True)
+    if not changes and not payload.close_open_requests:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    params = {"changed_by": current_user.id}
+    
+    if payload.ids is not None:
+        target_filter = "e.id = ANY(CAST(:ids AS INTEGER[]))"
+        params["ids"] = payload.ids
+    else:
+        criteria = payload.filter.model_dump(exclude_none=True)
+        if not criteria:
+            raise HTTPException(status_code=400, detail="Filter needs at least one field")
+        target_filter = " AND ".join(f"e.{column} = :filter_{column}" for column in criteria)
+        params.update({f"filter_{column}": value for column, value in criteria.items()})
+    
+    updates = [f"{column} = :set_{column}" for column in changes]
+    params.update({f"set_{column}": value for column, value in changes.items()})
+    updates.append("updated_at = NOW()")
+    
+    close_requests = ""
+    if payload.close_open_requests:
+        close_requests = f"""
+        , open_requests AS (
+            SELECT mr.id, mr.status FROM maintenancerequest mr
+            WHERE mr.equipment_id IN (SELECT id FROM updated)
+              AND mr.deleted_at IS NULL
+              AND mr.status IN ('new', 'in_progress')
+            ORDER BY mr.id
+            FOR UPDATE
+        ), closed AS (
+            UPDATE maintenancerequest mr
+            SET {status_transition_sql("'scrap'", "mr")}
+            FROM open_requests
+            WHERE mr.id = open_requests.id
+            RETURNING mr.id, open_requests.status as old_status
+        ), logged AS (
+            INSERT INTO requeststatuslog (request_id, old_status, new_status, changed_by, changed_at)
+            SELECT id, old_status, 'scrap', :changed_by, NOW() FROM closed
+        )"""
+    
+    # Rows are locked in id order so overlapping bulk updates cannot deadlock
+    query = text(f"""
+        WITH target AS (
+            SELECT e.id FROM equipment e
+            WHERE e.deleted_at IS NULL AND {target_filter}
+            ORDER BY e.id
+            FOR UPDATE
+        ), updated AS (
+            UPDATE equipment e
+            SET {", ".join(updates)}
+            FROM target
+            WHERE e.id = target.id
+            RETURNING e.id
+        ){close_requests}
+        SELECT 'equipment' as kind, id FROM updated
+        {"UNION ALL SELECT 'request' as kind, id FROM closed" if payload.close_open_requests else ""}
+    """)
+    
+    rows = (await db.execute(query, params)).fetchall()
+    
+    updated_ids = sorted(row.id for row in rows if row.kind == "equipment")
+    closed_ids = sorted(row.id for row in rows if row.kind == "request")
+    
+    # Split so each notification stays well under the pg_notify payload limit
+    for start in range(0, len(closed_ids), CHANGE_EVENT_MAX_IDS):
+        await publish_change(
+            db, "request", "status_changed",
+            ids=closed_ids[start:start + CHANGE_EVENT_MAX_IDS], newStatus="scrap",
+        )
+    await db.commit()
+    
+    return {"updated": updated_ids, "closedRequests": closed_ids}
+
+
 # ==================== DELETE Equipment ====================
 @router.delete("/equipment/{equipment_id}")
-def delete_equipment(
+async def delete_equipment(
     equipment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin"]))
 ):
     """Soft delete equipment (Admin only)"""
@@ -305,8 +664,8 @@ def delete_equipment(
         RETURNING id
     """)
     
-    result = db.execute(delete_query, {"equipment_id": equipment_id})
-    db.commit()
+    result = await db.execute(delete_query, {"equipment_id": equipment_id})
+    await db.commit()
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Equipment not found")
@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from ..core.config import settings
+from ..core.security import get_token_data
+from ..services.change_feed import change_feed
+
+router = APIRouter()
+
+
+# ==================== Change Feed ====================
+@router.get("/events")
+async def stream_events(request: Request, token_data = Depends(get_token_data)):
+    """
+    Server-sent events stream of request changes. Each event is a compact JSON
+    object such as {"entity": "request", "action": "status_changed", "id": 7};
+    clients refetch whatever the event touches. "feed"/"resync" means events
+    were lost or too large to send and everything should be refetched.
+    """
+    # Authenticated from the token alone so an open stream holds no pooled connection
+    async def event_stream():
+        # Subscribed only once the stream runs, so the finally below always unsubscribes
+        queue = change_feed.subscribe()
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['entity']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            change_feed.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
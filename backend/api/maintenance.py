@@ -1,100 +1,388 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
 
-from ..core.database import get_db
+from ..core.database import get_async_db, get_read_db
+from ..core.etag import REQUEST_DETAIL_TABLES, REQUEST_TABLES, conditional_get
+from ..core.pagination import decode_cursor, encode_cursor, estimate_row_count
+from ..core.projection import FieldSet
 from ..core.security import require_role
+from ..core.serialization import ORJSONResponse
+from ..models.maintenance import BulkStatusUpdate
+from ..services.import_service import (
+    ImportSpec,
+    choice_field,
+    collect_staging_errors,
+    date_field,
+    int_field,
+    stage_import,
+    text_field,
+)
+from ..services.change_feed import publish_change
+from ..services.dispatch import dispatch_index
+from ..services.request_service import REQUEST_STATUSES, status_transition_sql
+from ..services.sync_service import fetch_changes
 
 router = APIRouter()
 
 
 # ==================== GET Maintenance Requests List ====================
+REQUEST_FIELDS = FieldSet({
+    "id": "mr.id",
+    "subject": "mr.subject",
+    "description": "mr.description",
+    "requestType": "mr.request_type",
+    "status": "mr.status",
+    "scheduledDate": "mr.scheduled_date",
+    "startedAt": "mr.started_at",
+    "completedAt": "mr.completed_at",
+    "equipmentName": "e.name as equipment_name",
+    "serialNumber": "e.serial_number",
+    "teamName": "mt.name as team_name",
+    "technicianName": "tech.name as technician_name",
+    "createdByName": "creator.name as created_by_name",
+    "createdAt": "mr.created_at",
+    "updatedAt": "mr.updated_at",
+}, source="maintenancerequest mr", joins={
+    "e": "LEFT JOIN equipment e ON mr.equipment_id = e.id",
+    "mt": "LEFT JOIN maintenanceteam mt ON mr.maintenance_team_id = mt.id",
+    "tech": 'LEFT JOIN "User" tech ON mr.assigned_technician_id = tech.id',
+    "creator": 'LEFT JOIN "User" creator ON mr.created_by = creator.id',
+})
+
+# Keyset paging reads these whatever ?fields= asks for
+REQUEST_CURSOR_FIELDS = ("id", "createdAt")
+
+
 @router.get("/requests")
-def get_maintenance_requests(
+async def get_maintenance_requests(
+    request: Request,
     status: Optional[str] = None,
     request_type: Optional[str] = None,
     equipment_id: Optional[int] = None,
     team_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    with_total: Optional[str] = Query(None, pattern="^(exact|estimated)$"),
+    updated_since: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get list of maintenance requests with optional filters"""
+    """
+    Get a page of maintenance requests with optional filters, newest first.
+    Pages are keyed on (created_at, id); pass nextCursor back as cursor for the next page.
+    with_total=exact counts matching rows, with_total=estimated uses the planner's estimate.
     
-    query = """
-        SELECT 
-            mr.id,
-            mr.subject,
-            mr.description,
-            mr.request_type,
-            mr.status,
-            mr.scheduled_date,
-            mr.started_at,
-            mr.completed_at,
-            mr.created_at,
-            mr.updated_at,
-            e.name as equipment_name,
-            e.serial_number,
-            mt.name as team_name,
-            tech.name as technician_name,
-            creator.name as created_by_name
-        FROM maintenancerequest mr
-        JOIN equipment e ON mr.equipment_id = e.id
-        JOIN maintenanceteam mt ON mr.maintenance_team_id = mt.id
-        LEFT JOIN "User" tech ON mr.assigned_technician_id = tech.id
-        JOIN "User" creator ON mr.created_by = creator.id
+    With updated_since the endpoint returns changes instead: requests created or
+    updated since the token, tombstones for deleted ones, and a new watermark.
+    Start with updated_since=0 and pass the watermark back while hasMore is true.
+    
+    fields=id,subject,... returns only those fields; format=columnar returns one
+    array per field instead of one object per request.
+    """
+    
+    names = REQUEST_FIELDS.parse(fields)
+    columns = REQUEST_FIELDS.select(names, required=REQUEST_CURSOR_FIELDS)
+    source = REQUEST_FIELDS.from_clause(names, required=REQUEST_CURSOR_FIELDS)
+    
+    if updated_since is not None:
+        if status or request_type or equipment_id or team_id or cursor or with_total:
+            raise HTTPException(status_code=400, detail="updated_since cannot be combined with filters or paging")
+        rows, deleted, watermark, has_more = await fetch_changes(
+            db, columns, source, "mr", updated_since, limit
+        )
+        return ORJSONResponse({
+            "requests": REQUEST_FIELDS.render(rows, names, format),
+            "deleted": deleted,
+            "watermark": watermark,
+            "hasMore": has_more,
+        })
+    
+    cache_headers, not_modified = await conditional_get(request, db, REQUEST_TABLES)
+    if not_modified:
+        return not_modified
+    
+    from_clause = source + """
         WHERE mr.deleted_at IS NULL
     """
     
     params = {}
     
     if status:
-        query += " AND mr.status = :status"
+        from_clause += " AND mr.status = :status"
         params["status"] = status
     
     if request_type:
-        query += " AND mr.request_type = :request_type"
+        from_clause += " AND mr.request_type = :request_type"
         params["request_type"] = request_type
     
     if equipment_id:
-        query += " AND mr.equipment_id = :equipment_id"
+        from_clause += " AND mr.equipment_id = :equipment_id"
         params["equipment_id"] = equipment_id
     
     if team_id:
-        query += " AND mr.maintenance_team_id = :team_id"
+        from_clause += " AND mr.maintenance_team_id = :team_id"
         params["team_id"] = team_id
     
-    query += " ORDER BY mr.created_at DESC"
+    page_clause = from_clause
+    page_params = dict(params, limit=limit + 1)
+    
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor, 2)
+        try:
+            page_params["cursor_created_at"] = datetime.fromisoformat(cursor_created_at)
+            page_params["cursor_id"] = int(cursor_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page_clause += " AND (mr.created_at, mr.id) < (:cursor_created_at, :cursor_id)"
+    
+    query = f"""
+        SELECT {columns}
+        {page_clause}
+        ORDER BY mr.created_at DESC, mr.id DESC
+        LIMIT :limit
+    """
     
-    result = db.execute(text(query), params)
-    requests = []
+    rows = (await db.execute(text(query), page_params)).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    requests = REQUEST_FIELDS.render(rows, names, format)
     
-    for row in result:
-        requests.append({
-            "id": row.id,
-            "subject": row.subject,
-            "description": row.description,
-            "requestType": row.request_type,
-            "status": row.status,
-            "scheduledDate": row.scheduled_date.isoformat() if row.scheduled_date else None,
-            "startedAt": row.started_at.isoformat() if row.started_at else None,
-            "completedAt": row.completed_at.isoformat() if row.completed_at else None,
-            "equipmentName": row.equipment_name,
-            "serialNumber": row.serial_number,
-            "teamName": row.team_name,
-            "technicianName": row.technician_name,
-            "createdByName": row.created_by_name,
-            "createdAt": row.created_at.isoformat() if row.created_at else None,
-            "updatedAt": row.updated_at.isoformat() if row.updated_at else None,
-        })
+    total = None
+    if with_total == "exact":
+        total = (await db.execute(text(f"SELECT COUNT(*) {from_clause}"), params)).scalar()
+    elif with_total == "estimated":
+        total = await estimate_row_count(db, f"SELECT 1 {from_clause}", params)
     
-    return {"requests": requests, "total": len(requests)}
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+    
+    return ORJSONResponse({"requests": requests, "total": total, "nextCursor": next_cursor}, headers=cache_headers)
+
+
+# ==================== Kanban Board ====================
+@router.get("/requests/board")
+async def get_request_board(
+    request: Request,
+    per_column: int = Query(20, ge=1, le=100),
+    request_type: Optional[str] = None,
+    equipment_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    fields: Optional[str] = None,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the Kanban board in one query: for each status column, its newest
+    per_column cards and total count. A column's nextCursor continues it through
+    GET /requests?status=<column>&cursor=<nextCursor> with the same filters.
+    fields and format shape the cards as on GET /requests.
+    """
+    
+    cache_headers, not_modified = await conditional_get(request, db, REQUEST_TABLES)
+    if not_modified:
+        return not_modified
+    
+    names = REQUEST_FIELDS.parse(fields)
+    filters = ""
+    params = {"per_column": per_column}
+    
+    if request_type:
+        filters += " AND mr.request_type = :request_type"
+        params["request_type"] = request_type
+    
+    if equipment_id:
+        filters += " AND mr.equipment_id = :equipment_id"
+        params["equipment_id"] = equipment_id
+    
+    if team_id:
+        filters += " AND mr.maintenance_team_id = :team_id"
+        params["team_id"] = team_id
+    
+    # Cards are ranked on the bare table; only the ones shipped are joined for display
+    query = f"""
+        WITH ranked AS (
+            SELECT 
+                mr.id,
+                ROW_NUMBER() OVER (PARTITION BY mr.status ORDER BY mr.created_at DESC, mr.id DESC) as position,
+                COUNT(*) OVER (PARTITION BY mr.status) as column_total
+            FROM maintenancerequest mr
+            WHERE mr.deleted_at IS NULL {filters}
+        )
+        SELECT {REQUEST_FIELDS.select(names, required=REQUEST_CURSOR_FIELDS + ("status",))},
+            ranked.position,
+            ranked.column_total
+        {REQUEST_FIELDS.from_clause(names, required=REQUEST_CURSOR_FIELDS + ("status",))}
+        JOIN ranked ON ranked.id = mr.id
+        WHERE ranked.position <= :per_column + 1
+        ORDER BY mr.status, ranked.position
+    """
+    
+    rows = (await db.execute(text(query), params)).fetchall()
+    
+    columns = {
+        status: {"status": status, "total": 0, "requests": [], "nextCursor": None}
+        for status in REQUEST_STATUSES
+    }
+    cards = {status: [] for status in REQUEST_STATUSES}
+    
+    for row in rows:
+        column = columns[row.status]
+        column["total"] = row.column_total
+        if row.position > per_column:
+            last = cards[row.status][-1]
+            column["nextCursor"] = encode_cursor(last.created_at.isoformat(), last.id)
+            continue
+        cards[row.status].append(row)
+    
+    for status, column in columns.items():
+        column["requests"] = REQUEST_FIELDS.render(cards[status], names, format)
+    
+    return ORJSONResponse({"columns": list(columns.values())}, headers=cache_headers)
+
+
+# ==================== SEARCH Requests ====================
+@router.get("/requests/search")
+async def search_maintenance_requests(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[str] = None,
+    team_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Full-text search over request subject, description, equipment name/serial and
+    comments, best match first. q accepts web-search syntax ("quoted phrases",
+    OR, -excluded). Pages are keyed on (rank, id); pass nextCursor back as cursor.
+    Highlights wrap matches in <mark> tags around otherwise unescaped text.
+    """
+    
+    cache_headers, not_modified = await conditional_get(request, db, REQUEST_DETAIL_TABLES)
+    if not_modified:
+        return not_modified
+    
+    params = {"q": q, "limit": limit + 1}
+    filters = ""
+    
+    if status:
+        filters += " AND mr.status = :status"
+        params["status"] = status
+    
+    if team_id:
+        filters += " AND mr.maintenance_team_id = :team_id"
+        params["team_id"] = team_id
+    
+    page_filter = ""
+    if cursor:
+        cursor_rank, cursor_id = decode_cursor(cursor, 2)
+        if not isinstance(cursor_rank, (int, float)) or not isinstance(cursor_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page_filter = "WHERE (rank, id) < (:cursor_rank, :cursor_id)"
+        params["cursor_rank"] = float(cursor_rank)
+        params["cursor_id"] = cursor_id
+    
+    # Ranking needs every match, but headlines are only built for the page's rows
+    query = f"""
+        WITH q AS (
+            SELECT websearch_to_tsquery('english', :q) as query
+        ), candidates AS (
+            SELECT mr.id FROM maintenancerequest mr, q
+            WHERE mr.search_vector @@ q.query AND mr.deleted_at IS NULL
+            UNION
+            SELECT rc.request_id FROM requestcomment rc, q
+            WHERE rc.search_vector @@ q.query AND rc.deleted_at IS NULL
+        ), ranked AS (
+            SELECT 
+                mr.id,
+                CAST(
+                    ts_rank(mr.search_vector, q.query)
+                    + 0.5 * COALESCE((
+                        SELECT MAX(ts_rank(rc.search_vector, q.query))
+                        FROM requestcomment rc
+                        WHERE rc.request_id = mr.id AND rc.deleted_at IS NULL AND rc.search_vector @@ q.query
+                    ), 0)
+                AS FLOAT8) as rank
+            FROM candidates
+            JOIN maintenancerequest mr ON mr.id = candidates.id
+            CROSS JOIN q
+            WHERE mr.deleted_at IS NULL {filters}
+        ), page AS (
+            SELECT id, rank FROM ranked
+            {page_filter}
+            ORDER BY rank DESC, id DESC
+            LIMIT :limit
+        )
+        SELECT {REQUEST_FIELDS.select()},
+            page.rank,
+            ts_headline('english', mr.subject, q.query,
+                'StartSel=<mark>, StopSel=</mark>, HighlightAll=true') as subject_highlight,
+            ts_headline('english', COALESCE(mr.description, ''), q.query,
+                'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5') as description_highlight,
+            best_comment.id as comment_id,
+            best_comment.highlight as comment_highlight
+        {REQUEST_FIELDS.from_clause()}
+        JOIN page ON page.id = mr.id
+        CROSS JOIN q
+        LEFT JOIN LATERAL (
+            SELECT 
+                rc.id,
+                ts_headline('english', rc.comment, q.query,
+                    'StartSel=<mark>, StopSel=</mark>, MaxFragments=1, MaxWords=20, MinWords=5') as highlight
+            FROM requestcomment rc
+            WHERE rc.request_id = mr.id AND rc.deleted_at IS NULL AND rc.search_vector @@ q.query
+            ORDER BY ts_rank(rc.search_vector, q.query) DESC, rc.id DESC
+            LIMIT 1
+        ) best_comment ON true
+        ORDER BY page.rank DESC, page.id DESC
+    """
+    
+    rows = (await db.execute(text(query), params)).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    results = []
+    
+    for row in rows:
+        item = REQUEST_FIELDS.item(row)
+        item["rank"] = row.rank
+        item["highlights"] = {
+            "subject": row.subject_highlight,
+            "description": row.description_highlight or None,
+            "comment": {"id": row.comment_id, "text": row.comment_highlight} if row.comment_id else None,
+        }
+        results.append(item)
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.rank, last.id)
+    
+    return ORJSONResponse({"requests": results, "nextCursor": next_cursor}, headers=cache_headers)
 
 
 # ==================== GET Single Request ====================
 @router.get("/requests/{request_id}")
-def get_maintenance_request(request_id: int, db: Session = Depends(get_db)):
-    """Get detailed information about a maintenance request"""
+async def get_maintenance_request(
+    request_id: int,
+    request: Request,
+    comments_limit: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get detailed information about a maintenance request.
+    Status history and comments are aggregated in the same statement;
+    comments_limit keeps only the most recent comments.
+    """
+    
+    cache_headers, not_modified = await conditional_get(request, db, REQUEST_DETAIL_TABLES)
+    if not_modified:
+        return not_modified
     
     query = text("""
         SELECT 
@@ -106,7 +394,41 @@ def get_maintenance_request(request_id: int, db: Session = Depends(get_db)):
             tech.name as technician_name,
             tech.email as technician_email,
             creator.name as created_by_name,
-            creator.email as created_by_email
+            creator.email as created_by_email,
+            COALESCE((
+                SELECT json_agg(json_build_object(
+                    'id', rsl.id,
+                    'oldStatus', rsl.old_status,
+                    'newStatus', rsl.new_status,
+                    'changedAt', rsl.changed_at,
+                    'changedByName', u.name
+                ) ORDER BY rsl.changed_at ASC)
+                FROM requeststatuslog rsl
+                LEFT JOIN "User" u ON rsl.changed_by = u.id
+                WHERE rsl.request_id = mr.id
+            ), '[]'::json) as status_history,
+            COALESCE((
+                SELECT json_agg(json_build_object(
+                    'id', c.id,
+                    'comment', c.comment,
+                    'createdAt', c.created_at,
+                    'commenterName', c.commenter_name,
+                    'avatarUrl', c.avatar_url
+                ) ORDER BY c.created_at ASC)
+                FROM (
+                    SELECT 
+                        rc.id,
+                        rc.comment,
+                        rc.created_at,
+                        u.name as commenter_name,
+                        u.avatar_url
+                    FROM requestcomment rc
+                    LEFT JOIN "User" u ON rc.commented_by = u.id
+                    WHERE rc.request_id = mr.id AND rc.deleted_at IS NULL
+                    ORDER BY rc.created_at DESC
+                    LIMIT :comments_limit
+                ) c
+            ), '[]'::json) as comments
         FROM maintenancerequest mr
         JOIN equipment e ON mr.equipment_id = e.id
         JOIN maintenanceteam mt ON mr.maintenance_team_id = mt.id
@@ -115,44 +437,12 @@ def get_maintenance_request(request_id: int, db: Session = Depends(get_db)):
         WHERE mr.id = :request_id AND mr.deleted_at IS NULL
     """)
     
-    result = db.execute(query, {"request_id": request_id}).fetchone()
+    result = (await db.execute(query, {"request_id": request_id, "comments_limit": comments_limit})).fetchone()
     
     if not result:
         raise HTTPException(status_code=404, detail="Request not found")
     
-    # Get status history
-    status_query = text("""
-        SELECT 
-            rsl.id,
-            rsl.old_status,
-            rsl.new_status,
-            rsl.changed_at,
-            u.name as changed_by_name
-        FROM requeststatuslog rsl
-        LEFT JOIN "User" u ON rsl.changed_by = u.id
-        WHERE rsl.request_id = :request_id
-        ORDER BY rsl.changed_at ASC
-    """)
-    
-    status_history = db.execute(status_query, {"request_id": request_id}).fetchall()
-    
-    # Get comments
-    comments_query = text("""
-        SELECT 
-            rc.id,
-            rc.comment,
-            rc.created_at,
-            u.name as commenter_name,
-            u.avatar_url
-        FROM requestcomment rc
-        LEFT JOIN "User" u ON rc.commented_by = u.id
-        WHERE rc.request_id = :request_id AND rc.deleted_at IS NULL
-        ORDER BY rc.created_at ASC
-    """)
-    
-    comments = db.execute(comments_query, {"request_id": request_id}).fetchall()
-    
-    return {
+    return ORJSONResponse({
         "id": result.id,
         "subject": result.subject,
         "description": result.description,
@@ -167,55 +457,48 @@ def get_maintenance_request(request_id: int, db: Session = Depends(get_db)):
         "assignedTechnicianId": result.assigned_technician_id,
         "technicianName": result.technician_name,
         "technicianEmail": result.technician_email,
-        "scheduledDate": result.scheduled_date.isoformat() if result.scheduled_date else None,
-        "startedAt": result.started_at.isoformat() if result.started_at else None,
-        "completedAt": result.completed_at.isoformat() if result.completed_at else None,
+        "scheduledDate": result.scheduled_date,
+        "startedAt": result.started_at,
+        "completedAt": result.completed_at,
         "createdBy": result.created_by,
         "createdByName": result.created_by_name,
         "createdByEmail": result.created_by_email,
-        "createdAt": result.created_at.isoformat() if result.created_at else None,
-        "updatedAt": result.updated_at.isoformat() if result.updated_at else None,
-        "statusHistory": [
-            {
-                "id": sh.id,
-                "oldStatus": sh.old_status,
-                "newStatus": sh.new_status,
-                "changedAt": sh.changed_at.isoformat() if sh.changed_at else None,
-                "changedByName": sh.changed_by_name,
-            }
-            for sh in status_history
-        ],
-        "comments": [
-            {
-                "id": c.id,
-                "comment": c.comment,
-                "createdAt": c.created_at.isoformat() if c.created_at else None,
-                "commenterName": c.commenter_name,
-                "avatarUrl": c.avatar_url,
-            }
-            for c in comments
-        ]
-    }
+        "createdAt": result.created_at,
+        "updatedAt": result.updated_at,
+        "statusHistory": result.status_history,
+        "comments": result.comments,
+    }, headers=cache_headers)
 
 
 # ==================== CREATE Request ====================
 @router.post("/requests")
-def create_maintenance_request(
+async def create_maintenance_request(
     subject: str,
     description: Optional[str] = None,
     request_type: str = "corrective",
     equipment_id: int = None,
     maintenance_team_id: int = None,
     assigned_technician_id: Optional[int] = None,
-    scheduled_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    scheduled_date: Optional[date] = None,
+    auto_assign: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager", "employee"]))
 ):
-    """Create new maintenance request"""
+    """
+    Create new maintenance request.
+    With auto_assign and no assigned_technician_id, the request goes to the
+    technician of its team with the fewest open requests.
+    """
     
     if request_type not in ["corrective", "preventive"]:
         raise HTTPException(status_code=400, detail="Invalid request type")
     
+    reserved = None
+    if auto_assign and assigned_technician_id is None:
+        if maintenance_team_id is None:
+            raise HTTPException(status_code=400, detail="auto_assign requires maintenance_team_id")
+        reserved = assigned_technician_id = await dispatch_index.reserve(db, maintenance_team_id)
+    
     insert_query = text("""
         INSERT INTO maintenancerequest (
             subject, description, request_type, status, equipment_id,
@@ -228,33 +511,121 @@ def create_maintenance_request(
         ) RETURNING id
     """)
     
-    result = db.execute(insert_query, {
-        "subject": subject,
-        "description": description,
-        "request_type": request_type,
-        "equipment_id": equipment_id,
-        "maintenance_team_id": maintenance_team_id,
-        "assigned_technician_id": assigned_technician_id,
-        "scheduled_date": scheduled_date,
-        "created_by": current_user.id,
-    })
+    try:
+        result = await db.execute(insert_query, {
+            "subject": subject,
+            "description": description,
+            "request_type": request_type,
+            "equipment_id": equipment_id,
+            "maintenance_team_id": maintenance_team_id,
+            "assigned_technician_id": assigned_technician_id,
+            "scheduled_date": scheduled_date,
+            "created_by": current_user.id,
+        })
+        request_id = result.fetchone()[0]
+        
+        await publish_change(
+            db, "request", "created",
+            id=request_id, teamId=maintenance_team_id, technicianId=assigned_technician_id,
+        )
+        await db.commit()
+        dispatch_index.track(request_id, assigned_technician_id)
+    finally:
+        if reserved is not None:
+            dispatch_index.release(reserved)
     
-    db.commit()
-    request_id = result.fetchone()[0]
+    return {
+        "id": request_id,
+        "assignedTechnicianId": assigned_technician_id,
+        "message": "Maintenance request created successfully",
+    }
+
+
+# ==================== IMPORT Requests ====================
+REQUEST_IMPORT = ImportSpec("request_import", [
+    ("subject", "VARCHAR(200)", text_field(200, required=True)),
+    ("description", "TEXT", text_field()),
+    ("request_type", "VARCHAR(20)", choice_field(("corrective", "preventive"), default="corrective")),
+    ("equipment_id", "INTEGER", int_field(required=True)),
+    ("maintenance_team_id", "INTEGER", int_field()),
+    ("assigned_technician_id", "INTEGER", int_field()),
+    ("scheduled_date", "DATE", date_field()),
+])
+
+
+@router.post("/requests/import")
+async def import_maintenance_requests(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role(["admin", "manager", "employee"]))
+):
+    """
+    Bulk-create maintenance requests from a streamed CSV (header row) or NDJSON body.
+    Rows without maintenance_team_id inherit the equipment's team. Rows that fail
+    validation are reported per line without aborting the file.
+    """
+    
+    report = await stage_import(db, request, format, REQUEST_IMPORT)
+    
+    await db.execute(text("""
+        UPDATE request_import s
+        SET error = checks.error
+        FROM (
+            SELECT 
+                st.line_no,
+                CASE
+                    WHEN e.id IS NULL THEN 'Equipment not found'
+                    WHEN COALESCE(st.maintenance_team_id, e.maintenance_team_id) IS NULL
+                        THEN 'maintenance_team_id is required (equipment has no team)'
+                    WHEN mt.id IS NULL THEN 'Maintenance team not found'
+                    WHEN st.assigned_technician_id IS NOT NULL AND u.id IS NULL THEN 'Technician not found'
+                END as error
+            FROM request_import st
+            LEFT JOIN equipment e ON e.id = st.equipment_id AND e.deleted_at IS NULL
+            LEFT JOIN maintenanceteam mt
+                ON mt.id = COALESCE(st.maintenance_team_id, e.maintenance_team_id) AND mt.deleted_at IS NULL
+            LEFT JOIN "User" u ON u.id = st.assigned_technician_id AND u.deleted_at IS NULL
+        ) checks
+        WHERE checks.line_no = s.line_no AND checks.error IS NOT NULL
+    """))
+    
+    result = await db.execute(text("""
+        INSERT INTO maintenancerequest (
+            subject, description, request_type, status, equipment_id,
+            maintenance_team_id, assigned_technician_id, scheduled_date,
+            created_by, created_at, updated_at
+        )
+        SELECT 
+            s.subject, s.description, s.request_type, 'new', s.equipment_id,
+            COALESCE(s.maintenance_team_id, e.maintenance_team_id), s.assigned_technician_id, s.scheduled_date,
+            :created_by, NOW(), NOW()
+        FROM request_import s
+        JOIN equipment e ON e.id = s.equipment_id
+        WHERE s.error IS NULL
+        ORDER BY s.line_no
+    """), {"created_by": current_user.id})
+    
+    inserted = result.rowcount
+    await collect_staging_errors(db, REQUEST_IMPORT, report)
     
-    return {"id": request_id, "message": "Maintenance request created successfully"}
+    if inserted:
+        await publish_change(db, "request", "imported", count=inserted)
+    await db.commit()
+    
+    return report.to_dict(inserted)
 
 
 # ==================== UPDATE Request ====================
 @router.put("/requests/{request_id}")
-def update_maintenance_request(
+async def update_maintenance_request(
     request_id: int,
     subject: Optional[str] = None,
     description: Optional[str] = None,
     request_type: Optional[str] = None,
     assigned_technician_id: Optional[int] = None,
-    scheduled_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    scheduled_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager", "technician"]))
 ):
     """Update maintenance request"""
@@ -296,83 +667,197 @@ def update_maintenance_request(
         RETURNING id
     """)
     
-    result = db.execute(update_query, params)
-    db.commit()
+    result = await db.execute(update_query, params)
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Request not found")
     
+    # A reassignment moves load between technicians for auto-dispatch
+    reassigned = {"technicianId": assigned_technician_id} if assigned_technician_id is not None else {}
+    await publish_change(db, "request", "updated", id=request_id, **reassigned)
+    await db.commit()
+    
     return {"message": "Request updated successfully"}
 
 
+# ==================== BULK UPDATE Request Status ====================
+@router.patch("/requests/status:bulk")
+async def bulk_update_request_status(
+    payload: BulkStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role(["admin", "manager", "technician"]))
+):
+    """
+    Apply many status transitions and their log rows in one transaction.
+    Each item follows the same rules as the single-request endpoint and gets its
+    own result: updated, not_found, or conflict when expected_status did not match.
+    """
+    
+    transitions = payload.transitions
+    
+    ids = [t.id for t in transitions]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Each request may appear only once")
+    
+    for t in transitions:
+        if t.status not in REQUEST_STATUSES:
+            raise HTTPException(status_code=400, detail=f"Invalid status for request {t.id}")
+        if t.expected_status is not None and t.expected_status not in REQUEST_STATUSES:
+            raise HTTPException(status_code=400, detail=f"Invalid expected status for request {t.id}")
+    
+    # Rows are locked in id order so overlapping bulk moves cannot deadlock
+    transition_query = text(f"""
+        WITH items AS (
+            SELECT * FROM unnest(
+                CAST(:ids AS INTEGER[]),
+                CAST(:statuses AS VARCHAR[]),
+                CAST(:expected_statuses AS VARCHAR[])
+            ) WITH ORDINALITY AS t(id, status, expected_status, ord)
+        ), prev AS (
+            SELECT mr.id, mr.status FROM maintenancerequest mr
+            WHERE mr.id IN (SELECT id FROM items) AND mr.deleted_at IS NULL
+            ORDER BY mr.id
+            FOR UPDATE
+        ), updated AS (
+            UPDATE maintenancerequest mr
+            SET {status_transition_sql("items.status", "mr")}
+            FROM items
+            JOIN prev ON prev.id = items.id
+            WHERE mr.id = items.id
+              AND (items.expected_status IS NULL OR prev.status = items.expected_status)
+            RETURNING mr.id, prev.status as old_status, items.status as new_status
+        ), logged AS (
+            INSERT INTO requeststatuslog (request_id, old_status, new_status, changed_by, changed_at)
+            SELECT id, old_status, new_status, :changed_by, NOW() FROM updated
+        )
+        SELECT 
+            items.id,
+            prev.status as current_status,
+            updated.old_status,
+            updated.new_status
+        FROM items
+        LEFT JOIN prev ON prev.id = items.id
+        LEFT JOIN updated ON updated.id = items.id
+        ORDER BY items.ord
+    """)
+    
+    result = await db.execute(transition_query, {
+        "ids": ids,
+        "statuses": [t.status for t in transitions],
+        "expected_statuses": [t.expected_status for t in transitions],
+        "changed_by": current_user.id,
+    })
+    
+    results = []
+    updated_count = 0
+    
+    for row in result:
+        if row.current_status is None:
+            outcome = "not_found"
+        elif row.old_status is None:
+            outcome = "conflict"
+        else:
+            outcome = "updated"
+            updated_count += 1
+        results.append({
+            "id": row.id,
+            "result": outcome,
+            "oldStatus": row.old_status,
+            "newStatus": row.new_status,
+            "currentStatus": row.new_status if outcome == "updated" else row.current_status,
+        })
+    
+    if updated_count:
+        await publish_change(
+            db, "request", "status_changed",
+            ids=[r["id"] for r in results if r["result"] == "updated"],
+        )
+    await db.commit()
+    
+    return {"results": results, "updated": updated_count}
+
+
 # ==================== UPDATE Request Status ====================
 @router.patch("/requests/{request_id}/status")
-def update_request_status(
+async def update_request_status(
     request_id: int,
     status: str,
-    db: Session = Depends(get_db),
+    expected_status: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager", "technician"]))
 ):
-    """Update request status and log the change"""
+    """
+    Update request status and log the change in a single statement.
+    With expected_status the move only happens if the request is still in that
+    status; otherwise 409 is returned with the current status.
+    """
     
-    if status not in ["new", "in_progress", "repaired", "scrap"]:
+    if status not in REQUEST_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid status")
     
-    # Get current status
-    current_status_query = text("""
-        SELECT status FROM maintenancerequest
-        WHERE id = :request_id AND deleted_at IS NULL
-    """)
-    current = db.execute(current_status_query, {"request_id": request_id}).fetchone()
-    
-    if not current:
-        raise HTTPException(status_code=404, detail="Request not found")
-    
-    old_status = current.status
-    
-    # Update status
-    update_query = text("""
-        UPDATE maintenancerequest
-        SET status = :status, 
-            started_at = CASE WHEN :status = 'in_progress' AND started_at IS NULL THEN NOW() ELSE started_at END,
-            completed_at = CASE WHEN :status IN ('repaired', 'scrap') AND completed_at IS NULL THEN NOW() ELSE completed_at END,
-            updated_at = NOW()
-        WHERE id = :request_id
+    if expected_status is not None and expected_status not in REQUEST_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid expected status")
+    
+    # Lock the row so concurrent moves of the same card log the status they actually replaced
+    transition_query = text(f"""
+        WITH prev AS (
+            SELECT id, status FROM maintenancerequest
+            WHERE id = :request_id AND deleted_at IS NULL
+            FOR UPDATE
+        ), updated AS (
+            UPDATE maintenancerequest mr
+            SET {status_transition_sql(":status", "mr")}
+            FROM prev
+            WHERE mr.id = prev.id
+              AND (CAST(:expected_status AS VARCHAR) IS NULL OR prev.status = :expected_status)
+            RETURNING mr.id, prev.status as old_status
+        ), logged AS (
+            INSERT INTO requeststatuslog (request_id, old_status, new_status, changed_by, changed_at)
+            SELECT id, old_status, :status, :changed_by, NOW() FROM updated
+        )
+        SELECT prev.status as current_status, updated.old_status
+        FROM prev
+        LEFT JOIN updated ON updated.id = prev.id
     """)
     
-    db.execute(update_query, {"request_id": request_id, "status": status})
+    result = (await db.execute(transition_query, {
+        "request_id": request_id,
+        "status": status,
+        "expected_status": expected_status,
+        "changed_by": current_user.id,
+    })).fetchone()
     
-    # Log status change
-    log_query = text("""
-        INSERT INTO requeststatuslog (request_id, old_status, new_status, changed_by, changed_at)
-        VALUES (:request_id, :old_status, :new_status, :changed_by, NOW())
-    """)
+    if not result:
+        raise HTTPException(status_code=404, detail="Request not found")
     
-    db.execute(log_query, {
-        "request_id": request_id,
-        "old_status": old_status,
-        "new_status": status,
-        "changed_by": current_user.id
-    })
+    if result.old_status is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Request status is '{result.current_status}', expected '{expected_status}'",
+        )
     
-    db.commit()
+    await publish_change(
+        db, "request", "status_changed",
+        id=request_id, oldStatus=result.old_status, newStatus=status,
+    )
+    await db.commit()
     
-    return {"message": "Status updated successfully", "oldStatus": old_status, "newStatus": status}
+    return {"message": "Status updated successfully", "oldStatus": result.old_status, "newStatus": status}
 
 
 # ==================== ADD Comment ====================
 @router.post("/requests/{request_id}/comments")
-def add_comment(
+async def add_comment(
     request_id: int,
     comment: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager", "technician", "employee"]))
 ):
     """Add a comment to a maintenance request"""
     
     # Check if request exists
     check_query = text('SELECT id FROM maintenancerequest WHERE id = :request_id AND deleted_at IS NULL')
-    if not db.execute(check_query, {"request_id": request_id}).fetchone():
+    if not (await db.execute(check_query, {"request_id": request_id})).fetchone():
         raise HTTPException(status_code=404, detail="Request not found")
     
     insert_query = text("""
@@ -381,23 +866,24 @@ def add_comment(
         RETURNING id
     """)
     
-    result = db.execute(insert_query, {
+    result = await db.execute(insert_query, {
         "request_id": request_id,
         "comment": comment,
         "commented_by": current_user.id
     })
-    
-    db.commit()
     comment_id = result.fetchone()[0]
     
+    await publish_change(db, "request", "commented", id=request_id, commentId=comment_id)
+    await db.commit()
+    
     return {"id": comment_id, "message": "Comment added successfully"}
 
 
 # ==================== DELETE Request ====================
 @router.delete("/requests/{request_id}")
-def delete_maintenance_request(
+async def delete_maintenance_request(
     request_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin"]))
 ):
     """Soft delete maintenance request (Admin only)"""
@@ -409,10 +895,12 @@ def delete_maintenance_request(
         RETURNING id
     """)
     
-    result = db.execute(delete_query, {"request_id": request_id})
-    db.commit()
+    result = await db.execute(delete_query, {"request_id": request_id})
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Request not found")
     
+    await publish_change(db, "request", "deleted", id=request_id)
+    await db.commit()
+    
     return {"message": "Request deleted successfully"}
@@ -1,56 +1,59 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import Optional
+from datetime import date
 
-from ..core.database import get_db
+from ..core.database import get_read_db
+from ..core.projection import FieldSet
+from ..core.serialization import ORJSONResponse
 
 router = APIRouter()
 
 
 # ==================== Dashboard Statistics ====================
 @router.get("/dashboard/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_read_db)):
     """Get dashboard statistics"""
     
     # Total equipment count
-    equipment_count = db.execute(text("""
+    equipment_count = (await db.execute(text("""
         SELECT COUNT(*) as total,
                SUM(CASE WHEN is_scrapped = false THEN 1 ELSE 0 END) as active,
                SUM(CASE WHEN is_scrapped = true THEN 1 ELSE 0 END) as scrapped
         FROM equipment
         WHERE deleted_at IS NULL
-    """)).fetchone()
+    """))).fetchone()
     
     # Maintenance requests by status
-    requests_by_status = db.execute(text("""
+    requests_by_status = (await db.execute(text("""
         SELECT 
             status,
             COUNT(*) as count
         FROM maintenancerequest
         WHERE deleted_at IS NULL
         GROUP BY status
-    """)).fetchall()
+    """))).fetchall()
     
     # Requests by type
-    requests_by_type = db.execute(text("""
+    requests_by_type = (await db.execute(text("""
         SELECT 
             request_type,
             COUNT(*) as count
         FROM maintenancerequest
         WHERE deleted_at IS NULL
         GROUP BY request_type
-    """)).fetchall()
+    """))).fetchall()
     
     # Teams count
-    teams_count = db.execute(text("""
+    teams_count = (await db.execute(text("""
         SELECT COUNT(*) as total
         FROM maintenanceteam
         WHERE deleted_at IS NULL
-    """)).fetchone()
+    """))).fetchone()
     
     # Recent activity (last 5 requests)
-    recent_activity = db.execute(text("""
+    recent_activity = (await db.execute(text("""
         SELECT 
             mr.id,
             mr.subject,
@@ -64,7 +67,7 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
         WHERE mr.deleted_at IS NULL
         ORDER BY mr.created_at DESC
         LIMIT 5
-    """)).fetchall()
+    """))).fetchall()
     
     status_dict = {status.status: status.count for status in requests_by_status}
     type_dict = {req_type.request_type: req_type.count for req_type in requests_by_type}
@@ -98,7 +101,7 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
                 "status": activity.status,
                 "equipmentName": activity.equipment_name,
                 "createdByName": activity.created_by_name,
-                "createdAt": activity.created_at.isoformat() if activity.created_at else None
+                "createdAt": activity.created_at
             }
             for activity in recent_activity
         ]
@@ -106,30 +109,43 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
 
 
 # ====================Calendar Events ====================
+CALENDAR_FIELDS = FieldSet({
+    "id": "mr.id",
+    "title": "mr.subject",
+    "description": "mr.description",
+    "status": "mr.status",
+    "scheduledDate": "mr.scheduled_date",
+    "startedAt": "mr.started_at",
+    "completedAt": "mr.completed_at",
+    "equipmentName": "e.name as equipment_name",
+    "teamName": "mt.name as team_name",
+    "technicianName": "u.name as technician_name",
+}, source="maintenancerequest mr", joins={
+    "e": "LEFT JOIN equipment e ON mr.equipment_id = e.id",
+    "mt": "LEFT JOIN maintenanceteam mt ON mr.maintenance_team_id = mt.id",
+    "u": 'LEFT JOIN "User" u ON mr.assigned_technician_id = u.id',
+})
+
+
 @router.get("/calendar/events")
-def get_calendar_events(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+async def get_calendar_events(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    fields: Optional[str] = None,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get scheduled maintenance events for calendar"""
+    """
+    Get scheduled maintenance events for calendar.
+    fields=id,title,... returns only those fields; format=columnar returns one
+    array per field instead of one object per event.
+    """
     
-    query = """
-        SELECT 
-            mr.id,
-            mr.subject,
-            mr.description,
-            mr.status,
-            mr.scheduled_date,
-            mr.started_at,
-            mr.completed_at,
-            e.name as equipment_name,
-            mt.name as team_name,
-            u.name as technician_name
-        FROM maintenancerequest mr
-        JOIN equipment e ON mr.equipment_id = e.id
-        JOIN maintenanceteam mt ON mr.maintenance_team_id = mt.id
-        LEFT JOIN "User" u ON mr.assigned_technician_id = u.id
+    names = CALENDAR_FIELDS.parse(fields)
+    
+    query = f"""
+        SELECT {CALENDAR_FIELDS.select(names, required=("id",))}
+        {CALENDAR_FIELDS.from_clause(names, required=("id",))}
         WHERE mr.deleted_at IS NULL
           AND mr.scheduled_date IS NOT NULL
     """
@@ -146,29 +162,14 @@ def get_calendar_events(
     
     query += " ORDER BY mr.scheduled_date ASC"
     
-    result = db.execute(text(query), params)
-    events = []
-    
-    for row in result:
-        events.append({
-            "id": row.id,
-            "title": row.subject,
-            "description": row.description,
-            "status": row.status,
-            "scheduledDate": row.scheduled_date.isoformat() if row.scheduled_date else None,
-            "startedAt": row.started_at.isoformat() if row.started_at else None,
-            "completedAt": row.completed_at.isoformat() if row.completed_at else None,
-            "equipmentName": row.equipment_name,
-            "teamName": row.team_name,
-            "technicianName": row.technician_name,
-        })
+    rows = (await db.execute(text(query), params)).fetchall()
     
-    return {"events": events, "total": len(events)}
+    return ORJSONResponse({"events": CALENDAR_FIELDS.render(rows, names, format), "total": len(rows)})
 
 
 # ==================== Reports ====================
 @router.get("/reports/maintenance-by-team")
-def get_maintenance_by_team(db: Session = Depends(get_db)):
+async def get_maintenance_by_team(db: AsyncSession = Depends(get_read_db)):
     """Get maintenance statistics by team"""
     
     query = text("""
@@ -187,7 +188,7 @@ def get_maintenance_by_team(db: Session = Depends(get_db)):
         ORDER BY total_requests DESC
     """)
     
-    result = db.execute(query)
+    result = await db.execute(query)
     teams = []
     
     for row in result:
@@ -205,7 +206,7 @@ def get_maintenance_by_team(db: Session = Depends(get_db)):
 
 
 @router.get("/reports/equipment-status")
-def get_equipment_status_report(db: Session = Depends(get_db)):
+async def get_equipment_status_report(db: AsyncSession = Depends(get_read_db)):
     """Get equipment status report"""
     
     query = text("""
@@ -221,7 +222,7 @@ def get_equipment_status_report(db: Session = Depends(get_db)):
         ORDER BY total DESC
     """)
     
-    result = db.execute(query)
+    result = await db.execute(query)
     categories = []
     
     for row in result:
@@ -237,7 +238,7 @@ def get_equipment_status_report(db: Session = Depends(get_db)):
 
 
 @router.get("/reports/technician-workload")
-def get_technician_workload(db: Session = Depends(get_db)):
+async def get_technician_workload(db: AsyncSession = Depends(get_read_db)):
     """Get technician workload report"""
     
     query = text("""
@@ -255,7 +256,7 @@ def get_technician_workload(db: Session = Depends(get_db)):
         ORDER BY active_tasks DESC, total_assigned DESC
     """)
     
-    result = db.execute(query)
+    result = await db.execute(query)
     technicians = []
     
     for row in result:
@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import List, Optional
 
-from ..core.database import get_db
+from ..core.database import get_async_db
+from ..core.etag import TEAM_TABLES, conditional_get
 from ..core.security import require_role
+from ..core.serialization import ORJSONResponse, map_rows
+from ..models.team import TeamMembersUpdate
+from ..services.change_feed import publish_change
 
 router = APIRouter()
 
 
 # ==================== GET Teams List ====================
 @router.get("/teams")
-def get_teams_list(db: Session = Depends(get_db)):
+async def get_teams_list(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get list of all maintenance teams"""
     
+    cache_headers, not_modified = await conditional_get(request, db, TEAM_TABLES)
+    if not_modified:
+        return not_modified
+    
+    # Members and equipment are counted per team before joining, so the row count
+    # stays linear instead of members x equipment per team
     query = text("""
         SELECT 
             mt.id,
@@ -21,38 +31,39 @@ def get_teams_list(db: Session = Depends(get_db)):
             mt.description,
             mt.created_at,
             mt.updated_at,
-            COUNT(DISTINCT tm.user_id) as member_count,
-            COUNT(DISTINCT e.id) as equipment_count
+            COALESCE(members.member_count, 0) as member_count,
+            COALESCE(machines.equipment_count, 0) as equipment_count
         FROM maintenanceteam mt
-        LEFT JOIN teammember tm ON mt.id = tm.team_id AND tm.deleted_at IS NULL
-        LEFT JOIN equipment e ON mt.id = e.maintenance_team_id AND e.deleted_at IS NULL
+        LEFT JOIN (
+            SELECT team_id, COUNT(*) as member_count
+            FROM teammember
+            WHERE deleted_at IS NULL
+            GROUP BY team_id
+        ) members ON members.team_id = mt.id
+        LEFT JOIN (
+            SELECT maintenance_team_id, COUNT(*) as equipment_count
+            FROM equipment
+            WHERE deleted_at IS NULL
+            GROUP BY maintenance_team_id
+        ) machines ON machines.maintenance_team_id = mt.id
         WHERE mt.deleted_at IS NULL
-        GROUP BY mt.id, mt.name, mt.description, mt.created_at, mt.updated_at
         ORDER BY mt.created_at DESC
     """)
     
-    result = db.execute(query)
-    teams = []
-    
-    for row in result:
-        teams.append({
-            "id": row.id,
-            "name": row.name,
-            "description": row.description,
-            "memberCount": row.member_count,
-            "equipmentCount": row.equipment_count,
-            "createdAt": row.created_at.isoformat() if row.created_at else None,
-            "updatedAt": row.updated_at.isoformat() if row.updated_at else None,
-        })
-    
-    return {"teams": teams, "total": len(teams)}
+    teams = map_rows((await db.execute(query)).fetchall())
+    
+    return ORJSONResponse({"teams": teams, "total": len(teams)}, headers=cache_headers)
 
 
 # ==================== GET Single Team with Members ====================
 @router.get("/teams/{team_id}")
-def get_team(team_id: int, db: Session = Depends(get_db)):
+async def get_team(team_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get detailed information about a team including members"""
     
+    cache_headers, not_modified = await conditional_get(request, db, TEAM_TABLES)
+    if not_modified:
+        return not_modified
+    
     # Get team info
     team_query = text("""
         SELECT id, name, description, created_at, updated_at
@@ -60,7 +71,7 @@ def get_team(team_id: int, db: Session = Depends(get_db)):
         WHERE id = :team_id AND deleted_at IS NULL
     """)
     
-    team = db.execute(team_query, {"team_id": team_id}).fetchone()
+    team = (await db.execute(team_query, {"team_id": team_id})).fetchone()
     
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -80,7 +91,7 @@ def get_team(team_id: int, db: Session = Depends(get_db)):
         ORDER BY tm.created_at ASC
     """)
     
-    members = db.execute(members_query, {"team_id": team_id}).fetchall()
+    members = (await db.execute(members_query, {"team_id": team_id})).fetchall()
     
     # Get equipment assigned to this team
     equipment_query = text("""
@@ -90,51 +101,32 @@ def get_team(team_id: int, db: Session = Depends(get_db)):
         ORDER BY name ASC
     """)
     
-    equipment = db.execute(equipment_query, {"team_id": team_id}).fetchall()
+    equipment = (await db.execute(equipment_query, {"team_id": team_id})).fetchall()
     
-    return {
+    return ORJSONResponse({
         "id": team.id,
         "name": team.name,
         "description": team.description,
-        "createdAt": team.created_at.isoformat() if team.created_at else None,
-        "updatedAt": team.updated_at.isoformat() if team.updated_at else None,
-        "members": [
-            {
-                "id": m.id,
-                "name": m.name,
-                "email": m.email,
-                "role": m.role,
-                "avatarUrl": m.avatar_url,
-                "joinedAt": m.joined_at.isoformat() if m.joined_at else None,
-            }
-            for m in members
-        ],
-        "equipment": [
-            {
-                "id": eq.id,
-                "name": eq.name,
-                "serialNumber": eq.serial_number,
-                "category": eq.category,
-                "location": eq.location,
-            }
-            for eq in equipment
-        ]
-    }
+        "createdAt": team.created_at,
+        "updatedAt": team.updated_at,
+        "members": map_rows(members),
+        "equipment": map_rows(equipment),
+    }, headers=cache_headers)
 
 
 # ==================== CREATE Team ====================
 @router.post("/teams")
-def create_team(
+async def create_team(
     name: str,
     description: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager"]))
 ):
     """Create new maintenance team (Admin/Manager only)"""
     
     # Check if team name already exists
     check_query = text('SELECT id FROM maintenanceteam WHERE name = :name AND deleted_at IS NULL')
-    existing = db.execute(check_query, {"name": name}).fetchone()
+    existing = (await db.execute(check_query, {"name": name})).fetchone()
     
     if existing:
         raise HTTPException(status_code=400, detail="Team name already exists")
@@ -145,8 +137,8 @@ def create_team(
         RETURNING id
     """)
     
-    result = db.execute(insert_query, {"name": name, "description": description})
-    db.commit()
+    result = await db.execute(insert_query, {"name": name, "description": description})
+    await db.commit()
     team_id = result.fetchone()[0]
     
     return {"id": team_id, "message": "Team created successfully"}
@@ -154,11 +146,11 @@ def create_team(
 
 # ==================== UPDATE Team ====================
 @router.put("/teams/{team_id}")
-def update_team(
+async def update_team(
     team_id: int,
     name: Optional[str] = None,
     description: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager"]))
 ):
     """Update team (Admin/Manager only)"""
@@ -186,8 +178,8 @@ def update_team(
         RETURNING id
     """)
     
-    result = db.execute(update_query, params)
-    db.commit()
+    result = await db.execute(update_query, params)
+    await db.commit()
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Team not found")
@@ -197,9 +189,9 @@ def update_team(
 
 # ==================== DELETE Team ====================
 @router.delete("/teams/{team_id}")
-def delete_team(
+async def delete_team(
     team_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin"]))
 ):
     """Soft delete team (Admin only)"""
@@ -211,33 +203,35 @@ def delete_team(
         RETURNING id
     """)
     
-    result = db.execute(delete_query, {"team_id": team_id})
-    db.commit()
+    result = await db.execute(delete_query, {"team_id": team_id})
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Team not found")
     
+    await publish_change(db, "team", "deleted", id=team_id)
+    await db.commit()
+    
     return {"message": "Team deleted successfully"}
 
 
 # ==================== ADD Team Member ====================
 @router.post("/teams/{team_id}/members")
-def add_team_member(
+async def add_team_member(
     team_id: int,
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager"]))
 ):
     """Add a member to a team (Admin/Manager only)"""
     
     # Check if team exists
     team_check = text('SELECT id FROM maintenanceteam WHERE id = :team_id AND deleted_at IS NULL')
-    if not db.execute(team_check, {"team_id": team_id}).fetchone():
+    if not (await db.execute(team_check, {"team_id": team_id})).fetchone():
         raise HTTPException(status_code=404, detail="Team not found")
     
     # Check if user exists
     user_check = text('SELECT id FROM "User" WHERE id = :user_id AND deleted_at IS NULL')
-    if not db.execute(user_check, {"user_id": user_id}).fetchone():
+    if not (await db.execute(user_check, {"user_id": user_id})).fetchone():
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if already a member
@@ -245,7 +239,7 @@ def add_team_member(
         SELECT id FROM teammember 
         WHERE team_id = :team_id AND user_id = :user_id AND deleted_at IS NULL
     """)
-    if db.execute(member_check, {"team_id": team_id, "user_id": user_id}).fetchone():
+    if (await db.execute(member_check, {"team_id": team_id, "user_id": user_id})).fetchone():
         raise HTTPException(status_code=400, detail="User is already a member of this team")
     
     # Add member
@@ -255,18 +249,96 @@ def add_team_member(
         RETURNING id
     """)
     
-    result = db.execute(insert_query, {"team_id": team_id, "user_id": user_id})
-    db.commit()
+    result = await db.execute(insert_query, {"team_id": team_id, "user_id": user_id})
+    await publish_change(db, "team", "members_changed", id=team_id)
+    await db.commit()
     
     return {"message": "Member added successfully"}
 
 
+# ==================== SET Team Members ====================
+@router.put("/teams/{team_id}/members")
+async def set_team_members(
+    team_id: int,
+    payload: TeamMembersUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(require_role(["admin", "manager"]))
+):
+    """
+    Replace a team's members with the given user set (Admin/Manager only).
+    Missing users are added, or restored if they were members before, and
+    members not in the set are removed, in one statement.
+    """
+    
+    user_ids = sorted(set(payload.user_ids))
+    
+    # Check the team and every user at once; the team row lock serialises
+    # concurrent reconciles of the same team
+    check_query = text("""
+        SELECT 
+            mt.id,
+            ARRAY(
+                SELECT d.user_id FROM unnest(CAST(:user_ids AS INTEGER[])) AS d(user_id)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM "User" u WHERE u.id = d.user_id AND u.deleted_at IS NULL
+                )
+                ORDER BY d.user_id
+            ) as unknown_users
+        FROM maintenanceteam mt
+        WHERE mt.id = :team_id AND mt.deleted_at IS NULL
+        FOR UPDATE OF mt
+    """)
+    
+    check = (await db.execute(check_query, {"team_id": team_id, "user_ids": user_ids})).fetchone()
+    if not check:
+        raise HTTPException(status_code=404, detail="Team not found")
+    if check.unknown_users:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown users: {', '.join(str(user_id) for user_id in check.unknown_users)}",
+        )
+    
+    reconcile_query = text("""
+        WITH desired AS (
+            SELECT user_id FROM unnest(CAST(:user_ids AS INTEGER[])) AS d(user_id)
+        ), removed AS (
+            UPDATE teammember tm
+            SET deleted_at = NOW()
+            WHERE tm.team_id = :team_id
+              AND tm.deleted_at IS NULL
+              AND tm.user_id NOT IN (SELECT user_id FROM desired)
+            RETURNING tm.user_id
+        ), added AS (
+            INSERT INTO teammember (team_id, user_id, created_at)
+            SELECT :team_id, user_id, NOW() FROM desired
+            ON CONFLICT (team_id, user_id) DO UPDATE
+            SET deleted_at = NULL, created_at = NOW()
+            WHERE teammember.deleted_at IS NOT NULL
+            RETURNING user_id
+        )
+        SELECT 'added' as change, user_id FROM added
+        UNION ALL
+        SELECT 'removed' as change, user_id FROM removed
+    """)
+    
+    rows = (await db.execute(reconcile_query, {"team_id": team_id, "user_ids": user_ids})).fetchall()
+    if rows:
+        await publish_change(db, "team", "members_changed", id=team_id)
+    await db.commit()
+    
+    return {
+        "added": sorted(row.user_id for row in rows if row.change == "added"),
+        "removed": sorted(row.user_id for row in rows if row.change == "removed"),
+        "memberCount": len(user_ids),
+    }
+
+
 # ==================== REMOVE Team Member ====================
 @router.delete("/teams/{team_id}/members/{user_id}")
-def remove_team_member(
+async def remove_team_member(
     team_id: int,
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(require_role(["admin", "manager"]))
 ):
     """Remove a member from a team (Admin/Manager only)"""
@@ -278,10 +350,12 @@ def remove_team_member(
         RETURNING id
     """)
     
-    result = db.execute(delete_query, {"team_id": team_id, "user_id": user_id})
-    db.commit()
+    result = await db.execute(delete_query, {"team_id": team_id, "user_id": user_id})
     
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Team member not found")
     
+    await publish_change(db, "team", "members_changed", id=team_id)
+    await db.commit()
+    
     return {"message": "Member removed successfully"}
@@ -0,0 +1,90 @@
+"""
+Compare sync (thread pool) and async (asyncpg) database handlers under load.
+
+Both endpoints run the same query against the configured database; the sync one
+goes through get_db the way the routers used to, the async one through
+get_async_db. Requests are driven in-process with httpx, so the numbers isolate
+the app's concurrency model from network effects.
+
+Usage (needs a reachable PostgreSQL):
+    python -m backend.benchmarks.bench_db_modes --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.database import async_engine, engine, get_async_db, get_db
+
+QUERY = text("SELECT pg_sleep(:delay), COUNT(*) FROM maintenancerequest")
+
+app = FastAPI()
+
+
+@app.get("/sync")
+def sync_endpoint(delay: float, db: Session = Depends(get_db)):
+    db.execute(QUERY, {"delay": delay}).fetchone()
+    return {"ok": True}
+
+
+@app.get("/async")
+async def async_endpoint(delay: float, db: AsyncSession = Depends(get_async_db)):
+    (await db.execute(QUERY, {"delay": delay})).fetchone()
+    return {"ok": True}
+
+
+async def run_mode(path: str, total: int, concurrency: int, delay: float) -> dict:
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, params={"delay": delay})
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": path.strip("/"),
+        "requests_per_s": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 1),
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.01, help="server-side pg_sleep per query, in seconds")
+    args = parser.parse_args()
+
+    for path in ("/sync", "/async"):
+        # Warm the pools so connection setup is not counted
+        await run_mode(path, 50, 10, 0)
+        print(await run_mode(path, args.requests, args.concurrency, args.delay))
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
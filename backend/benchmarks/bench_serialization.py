@@ -0,0 +1,171 @@
+"""
+Compare the old and new paths from database rows to JSON bytes for list endpoints.
+
+old: hand-built dicts with .isoformat() per date, then FastAPI's jsonable_encoder
+     and Starlette's json.dumps based JSONResponse
+new: FieldSet row mapping, then ORJSONResponse rendering dates natively
+
+Rows are synthetic SQLAlchemy Row objects, so no database is needed.
+
+Usage:
+    python -m backend.benchmarks.bench_serialization --rows 10000 --repeat 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine.result import SimpleResultMetaData
+from sqlalchemy.engine.row import Row
+
+from ..api.equipment import EQUIPMENT_FIELDS
+from ..api.maintenance import REQUEST_FIELDS
+from ..core.serialization import ORJSONResponse
+
+
+def make_rows(fields, count: int, sample: dict) -> list:
+    labels = [label for _, label in fields.fields.values()]
+    metadata = SimpleResultMetaData(labels)
+    start = datetime(2024, 1, 1, 8, 30, 15, 123456)
+    rows = []
+    for i in range(count):
+        values = []
+        for label in labels:
+            value = sample[label]
+            if isinstance(value, datetime):
+                value = start + timedelta(minutes=i)
+            elif isinstance(value, date):
+                value = value + timedelta(days=i % 365)
+            elif label == "id":
+                value = i + 1
+            values.append(value)
+        rows.append(Row(metadata, None, metadata._key_to_index, tuple(values)))
+    return rows
+
+
+def old_request_item(row) -> dict:
+    return {
+        "id": row.id,
+        "subject": row.subject,
+        "description": row.description,
+        "requestType": row.request_type,
+        "status": row.status,
+        "scheduledDate": row.scheduled_date.isoformat() if row.scheduled_date else None,
+        "startedAt": row.started_at.isoformat() if row.started_at else None,
+        "completedAt": row.completed_at.isoformat() if row.completed_at else None,
+        "equipmentName": row.equipment_name,
+        "serialNumber": row.serial_number,
+        "teamName": row.team_name,
+        "technicianName": row.technician_name,
+        "createdByName": row.created_by_name,
+        "createdAt": row.created_at.isoformat() if row.created_at else None,
+        "updatedAt": row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+def old_equipment_item(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "serialNumber": row.serial_number,
+        "category": row.category,
+        "purchaseDate": row.purchase_date.isoformat() if row.purchase_date else None,
+        "warrantyExpiry": row.warranty_expiry.isoformat() if row.warranty_expiry else None,
+        "location": row.location,
+        "department": row.department,
+        "isScrapped": row.is_scrapped,
+        "maintenanceTeamId": row.maintenance_team_id,
+        "teamName": row.team_name,
+        "defaultTechnicianId": row.default_technician_id,
+        "technicianName": row.technician_name,
+        "createdAt": row.created_at.isoformat() if row.created_at else None,
+        "updatedAt": row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+REQUEST_SAMPLE = {
+    "id": 0,
+    "subject": "Hydraulic press leaking oil",
+    "description": "Oil pooling under the main cylinder after the night shift, needs seal check.",
+    "request_type": "corrective",
+    "status": "in_progress",
+    "scheduled_date": date(2024, 2, 1),
+    "started_at": datetime(2024, 1, 1),
+    "completed_at": None,
+    "equipment_name": "Hydraulic Press HP-200",
+    "serial_number": "HP200-00871",
+    "team_name": "Mechanical",
+    "technician_name": "Priya Sharma",
+    "created_by_name": "Arjun Mehta",
+    "created_at": datetime(2024, 1, 1),
+    "updated_at": datetime(2024, 1, 1),
+}
+
+EQUIPMENT_SAMPLE = {
+    "id": 0,
+    "name": "CNC Lathe L-40",
+    "serial_number": "CNC-L40-2231",
+    "category": "Machining",
+    "purchase_date": date(2021, 3, 15),
+    "warranty_expiry": date(2026, 3, 15),
+    "location": "Plant 2, Bay 4",
+    "department": "Production",
+    "is_scrapped": False,
+    "maintenance_team_id": 3,
+    "team_name": "Mechanical",
+    "default_technician_id": 17,
+    "technician_name": "Priya Sharma",
+    "created_at": datetime(2024, 1, 1),
+    "updated_at": None,
+}
+
+
+def time_path(fn, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    return {"median_ms": round(statistics.median(timings) * 1000, 1), "bytes": len(body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = (
+        ("requests", REQUEST_FIELDS, REQUEST_SAMPLE, old_request_item),
+        ("equipment", EQUIPMENT_FIELDS, EQUIPMENT_SAMPLE, old_equipment_item),
+    )
+    for key, fields, sample, old_item in cases:
+        rows = make_rows(fields, args.rows, sample)
+
+        def old():
+            content = jsonable_encoder({key: [old_item(row) for row in rows], "total": len(rows)})
+            return JSONResponse(content).body
+
+        def new():
+            return ORJSONResponse({key: fields.render(rows, fields.names), "total": len(rows)}).body
+
+        # Both paths must produce the same document
+        assert json.loads(old()) == json.loads(new())
+
+        old_result = time_path(old, args.repeat)
+        new_result = time_path(new, args.repeat)
+        print({
+            "list": key,
+            "rows": args.rows,
+            "old": old_result,
+            "new": new_result,
+            "speedup": round(old_result["median_ms"] / new_result["median_ms"], 1),
+        })
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,126 @@
+import itertools
+import time
 
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from .config import settings
+from .metrics import db_metrics
 
 engine = create_engine(settings.DATABASE_URL, pool_size=10, max_overflow=20)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+db_metrics.instrument("primary", engine)
+
+# Set on responses to successful mutations; while present the client reads from the primary
+RECENT_WRITE_COOKIE = "recent_write"
+
+
+def to_async_url(url: str) -> str:
+    """Point a postgresql:// URL at the asyncpg driver"""
+    _, rest = url.split("://", 1)
+    return f"postgresql+asyncpg://{rest}"
+
+
+def _create_async_engine(url: str):
+    return create_async_engine(
+        url,
+        pool_size=settings.ASYNC_POOL_SIZE,
+        max_overflow=settings.ASYNC_MAX_OVERFLOW,
+    )
+
+
+async_engine = _create_async_engine(settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+db_metrics.instrument("primaryAsync", async_engine.sync_engine)
+
+
+class ReplicaSet:
+    """Round-robin over read replicas, ejecting any that fail to connect for a while"""
+
+    def __init__(self, urls: list[str], retry_seconds: float):
+        self.engines = [_create_async_engine(to_async_url(url)) for url in urls]
+        self.sessionmakers = [
+            async_sessionmaker(replica, autoflush=False, expire_on_commit=False)
+            for replica in self.engines
+        ]
+        self.retry_seconds = retry_seconds
+        self._down_until = [0.0] * len(self.engines)
+        self._counter = itertools.count()
+        for i, replica in enumerate(self.engines):
+            db_metrics.instrument(f"replica{i}", replica.sync_engine)
+
+    def healthy(self) -> list[int]:
+        """Indexes of replicas currently in rotation, starting at the next round-robin slot"""
+        if not self.engines:
+            return []
+        now = time.monotonic()
+        start = next(self._counter) % len(self.engines)
+        order = [(start + i) % len(self.engines) for i in range(len(self.engines))]
+        return [i for i in order if self._down_until[i] <= now]
+
+    def mark_down(self, index: int):
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "healthy": self._down_until[i] <= now,
+            }
+            for i, replica in enumerate(self.engines)
+        ]
+
+
+replicas = ReplicaSet(settings.READ_REPLICA_URLS, settings.REPLICA_RETRY_SECONDS)
 
 Base = declarative_base()
 
+
+async def checkout(db: AsyncSession):
+    """Check out the session's connection up front, recording how long the pool made us wait"""
+    started = time.perf_counter()
+    await db.connection()
+    db_metrics.record_checkout((time.perf_counter() - started) * 1000)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        await checkout(db)
+        yield db
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only endpoints. Uses a healthy replica when one is configured,
+    falling back to the primary when none is reachable or the client wrote recently.
+    """
+    if request.cookies.get(RECENT_WRITE_COOKIE) is None:
+        for index in replicas.healthy():
+            db = replicas.sessionmakers[index]()
+            try:
+                # Check out a connection up front so a dead replica is detected here
+                await checkout(db)
+            except (DBAPIError, OSError):
+                await db.close()
+                replicas.mark_down(index)
+                continue
+            try:
+                yield db
+            finally:
+                await db.close()
+            return
+
+    async with AsyncSessionLocal() as db:
+        await checkout(db)
+        yield db
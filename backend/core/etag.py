@@ -0,0 +1,107 @@
+import asyncio
+import logging
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes are logged to tableversionlog by trg_*_version (see schema.sql)
+REQUEST_TABLES = ("maintenancerequest", "equipment", "maintenanceteam", "User")
+REQUEST_DETAIL_TABLES = REQUEST_TABLES + ("requeststatuslog", "requestcomment")
+EQUIPMENT_TABLES = ("equipment", "maintenanceteam", "User")
+TEAM_TABLES = ("maintenanceteam", "teammember", "equipment", "User")
+
+
+async def table_versions_etag(db: AsyncSession, tables: tuple) -> str:
+    """Weak ETag from the change counts of every table a view reads"""
+    rows = (await db.execute(text("""
+        SELECT table_name, SUM(changes) as version
+        FROM tableversionlog
+        WHERE table_name = ANY(CAST(:tables AS TEXT[]))
+        GROUP BY table_name
+    """), {"tables": list(tables)})).fetchall()
+    versions = {row.table_name: row.version for row in rows}
+    return 'W/"' + ".".join(str(versions.get(table, 0)) for table in tables) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of an ETag against the request's If-None-Match header"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+async def conditional_get(request: Request, db: AsyncSession, tables: tuple) -> tuple[dict, Response | None]:
+    """
+    Probe the version counters before running a view's query. Returns the cache
+    headers for the full response and, when the client's copy is current, a 304
+    to send as-is instead.
+    """
+    etag = await table_versions_etag(db, tables)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return headers, Response(status_code=304, headers=headers)
+    return headers, None
+
+
+class TableVersionCompactor:
+    """
+    Periodically folds each table's tableversionlog rows into a single row with
+    the summed changes, in one transaction, so version sums read a handful of
+    rows. Writers only ever insert, so this never blocks them; concurrent runs
+    from other workers are skipped through an advisory lock.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def compact(self):
+        async with AsyncSessionLocal() as db:
+            locked = (await db.execute(
+                text("SELECT pg_try_advisory_xact_lock(hashtext('tableversionlog_compact'))")
+            )).scalar()
+            if not locked:
+                return
+            await db.execute(text("""
+                WITH folded AS (
+                    DELETE FROM tableversionlog
+                    RETURNING table_name, changes
+                )
+                INSERT INTO tableversionlog (table_name, changes)
+                SELECT table_name, SUM(changes) FROM folded GROUP BY table_name
+            """))
+            await db.commit()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.compact()
+            except Exception:
+                logger.exception("Table version compaction failed")
+
+
+table_version_compactor = TableVersionCompactor(interval=settings.TABLE_VERSION_COMPACT_SECONDS)
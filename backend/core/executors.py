@@ -0,0 +1,78 @@
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from .config import settings
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a bounded executor already has max_pending jobs queued or running"""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables off the event loop on a size-limited pool.
+    Submissions beyond max_pending are rejected immediately instead of queueing.
+    """
+
+    def __init__(self, executor_class: type[Executor], max_workers: int, max_pending: int):
+        self.executor_class = executor_class
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = None
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never forks worker processes
+        if self._executor is None:
+            self._executor = self.executor_class(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        # Only touched from the event loop thread, so a plain counter is safe
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ExecutorSaturated()
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), functools.partial(fn, *args, **kwargs)
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "maxWorkers": self.max_workers,
+            "maxPending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+
+# Argon2 is CPU-bound, so hashing gets its own processes to stay clear of the GIL
+hash_executor = BoundedExecutor(
+    ProcessPoolExecutor,
+    max_workers=settings.AUTH_HASH_WORKERS,
+    max_pending=settings.AUTH_MAX_PENDING,
+)
+
+# Synchronous session work on the auth path (user lookup, signup insert)
+auth_db_executor = BoundedExecutor(
+    ThreadPoolExecutor,
+    max_workers=settings.AUTH_DB_WORKERS,
+    max_pending=settings.AUTH_MAX_PENDING,
+)
+
+
+def shutdown_executors():
+    hash_executor.shutdown()
+    auth_db_executor.shutdown()
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from .config import settings
+
+logger = logging.getLogger("gearguard.sql")
+
+# "METHOD /route/{template}" of the request currently being served, used to tag statements
+current_route: ContextVar[str] = ContextVar("current_route", default="-")
+
+
+class _Timing:
+    __slots__ = ("count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "totalMs": round(self.total_ms, 2),
+            "avgMs": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "maxMs": round(self.max_ms, 2),
+        }
+
+
+class DBMetrics:
+    """Per-worker pool checkout waits and statement latency, grouped by route"""
+
+    def __init__(self, slow_query_ms: float):
+        self.slow_query_ms = slow_query_ms
+        self.slow_queries = 0
+        self._checkout = _Timing()
+        self._statements = {}
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def record_checkout(self, ms: float):
+        with self._lock:
+            self._checkout.add(ms)
+
+    def record_statement(self, route: str, statement: str, ms: float):
+        with self._lock:
+            timing = self._statements.get(route)
+            if timing is None:
+                timing = self._statements[route] = _Timing()
+            timing.add(ms)
+            if ms >= self.slow_query_ms:
+                self.slow_queries += 1
+        if ms >= self.slow_query_ms:
+            logger.warning("Slow query (%.1f ms) on %s: %s", ms, route, " ".join(statement.split())[:500])
+
+    def instrument(self, name: str, engine):
+        """Attach statement timing hooks to a (sync) engine and track its pool"""
+        self._engines[name] = engine
+
+        # The start time lives on the per-statement context, so a failed statement
+        # (no after_cursor_execute) leaves nothing behind on the pooled connection
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            context._query_start = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            started = context._query_start
+            self.record_statement(current_route.get(), statement, (time.perf_counter() - started) * 1000)
+
+    def reset(self):
+        with self._lock:
+            self._checkout = _Timing()
+            self._statements = {}
+            self.slow_queries = 0
+
+    def snapshot(self) -> dict:
+        pools = {}
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            pools[name] = {
+                "size": pool.size(),
+                "checkedOut": pool.checkedout(),
+                "checkedIn": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        with self._lock:
+            return {
+                "pools": pools,
+                "checkoutWait": self._checkout.to_dict(),
+                # Sync get_db sessions (auth) check out lazily inside the auth
+                # executors and are not timed; their pool usage shows under pools
+                "checkoutWaitScope": "async sessions only",
+                "slowQueryThresholdMs": self.slow_query_ms,
+                "slowQueries": self.slow_queries,
+                "statementsByRoute": {
+                    route: timing.to_dict()
+                    for route, timing in sorted(self._statements.items())
+                },
+            }
+
+
+db_metrics = DBMetrics(slow_query_ms=settings.SLOW_QUERY_THRESHOLD_MS)
+
+
+async def tag_route(request: Request):
+    """App-wide dependency that labels SQL issued while serving this request with its route"""
+    path = request.url.path
+    route = request.scope.get("route")
+    if route is not None:
+        # Routes of included routers may carry their path without the router prefix
+        concrete = route.path_format.format(**request.path_params)
+        prefix = path[: len(path) - len(concrete)] if path.endswith(concrete) else ""
+        path = prefix + route.path
+    current_route.set(f"{request.method} {path}")
@@ -0,0 +1,78 @@
+from operator import itemgetter
+
+from fastapi import HTTPException
+
+
+class FieldSet:
+    """
+    The fields a list endpoint can return: per output name, the SQL select
+    expression. Lets ?fields= narrow the SELECT list, the joins behind it and the
+    serialized rows, and renders rows either as objects or columnar (one array
+    per field).
+
+    source is the base table with its alias; joins maps an alias to the JOIN that
+    brings it in. A field whose expression is qualified by a join alias pulls in
+    that join, so narrow projections skip lookups they do not show.
+
+    Values are passed through as the driver returns them; dates and datetimes are
+    encoded by the ORJSONResponse the handler returns.
+    """
+
+    def __init__(self, fields: dict[str, str], source: str, joins: dict[str, str] | None = None):
+        self.source = source
+        self.joins = joins or {}
+        self.fields = {}
+        for name, expression in fields.items():
+            # Row attribute: the alias after "as", else the bare column name
+            label = expression.split(" as ")[-1].split(".")[-1].strip()
+            self.fields[name] = (expression, label)
+        self.names = list(self.fields)
+
+    def parse(self, fields: str | None) -> list[str]:
+        """Output names requested by a ?fields= value (all of them when absent)"""
+        if not fields:
+            return self.names
+        names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(self.names)}",
+            )
+        return names
+
+    def select(self, names: list[str] | None = None, required: tuple = ()) -> str:
+        """SELECT list for the requested names plus any the handler needs itself"""
+        names = self.names if names is None else names
+        selected = list(dict.fromkeys([*names, *required]))
+        return ",\n            ".join(self.fields[name][0] for name in selected)
+
+    def from_clause(self, names: list[str] | None = None, required: tuple = ()) -> str:
+        """FROM clause with only the joins the selected fields read"""
+        names = self.names if names is None else names
+        aliases = {self.fields[name][0].split(".")[0] for name in [*names, *required]}
+        joins = [join for alias, join in self.joins.items() if alias in aliases]
+        return "\n        ".join([f"FROM {self.source}", *joins])
+
+    def _positions(self, row, names: list[str]) -> list[int]:
+        fields = row._fields
+        return [fields.index(self.fields[name][1]) for name in names]
+
+    def item(self, row, names: list[str] | None = None) -> dict:
+        return self.render([row], self.names if names is None else names)[0]
+
+    def render(self, rows, names: list[str], format: str = "rows"):
+        """Rows as a list of objects, or for format=columnar one array per field"""
+        if not rows:
+            return {name: [] for name in names} if format == "columnar" else []
+
+        positions = self._positions(rows[0], names)
+
+        if format == "columnar":
+            return {name: [row[position] for row in rows] for name, position in zip(names, positions)}
+
+        # One C-level tuple pick per row
+        pick = itemgetter(*positions)
+        if len(positions) == 1:
+            return [{names[0]: pick(row)} for row in rows]
+        return [dict(zip(names, pick(row))) for row in rows]
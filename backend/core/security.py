@@ -2,18 +2,24 @@ from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
+import hashlib
+import time
 
 from ..models import user, token
+from ..core.cache import TTLCache
 from ..core.config import settings
-from ..core.database import get_db
+from ..core.database import get_async_db
 from ..services import user_service
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login", auto_error=False)
 
+# Verified tokens, keyed by SHA-256 digest, each entry living until the token's exp
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=0)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -40,8 +46,26 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> user.User:
-    """Get current user from cookie token"""
+def decode_access_token(token_str: str) -> token.TokenData | None:
+    """Verify a JWT once per token lifetime, serving repeat lookups from the token cache"""
+    digest = hashlib.sha256(token_str.encode()).digest()
+    token_data = token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+
+    try:
+        payload = jwt.decode(token_str, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_data = token.TokenData(user_id=int(payload.get("sub")), role=payload.get("role"))
+    except (JWTError, ValueError, TypeError):
+        return None
+
+    expires_in = payload["exp"] - time.time()
+    if expires_in > 0:
+        token_cache.set(digest, token_data, ttl=expires_in)
+    return token_data
+
+def get_token_data(request: Request) -> token.TokenData:
+    """Verify the access token cookie without touching the database"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -57,18 +81,22 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> user.Us
     if token_str.startswith("Bearer "):
         token_str = token_str[7:]
     
-    try:
-        payload = jwt.decode(token_str, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: int = int(payload.get("sub"))
-        if user_id is None:
-            raise credentials_exception
-        token_data = token.TokenData(user_id=user_id, role=payload.get("role"))
-    except (JWTError, ValueError):
+    token_data = decode_access_token(token_str)
+    if token_data is None:
         raise credentials_exception
+    return token_data
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)) -> user.User:
+    """Get current user from cookie token"""
+    token_data = get_token_data(request)
     
-    user_obj = user_service.get_user_by_id(db, user_id=token_data.user_id)
+    user_obj = await user_service.get_principal_async(db, user_id=token_data.user_id)
     if user_obj is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user_obj
 
 def require_role(required_roles):
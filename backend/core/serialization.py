@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value):
+    # Types orjson leaves to the caller; NUMERIC aggregates come back as Decimal
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson, which encodes datetimes, dates and UUIDs
+    natively (same ISO format as .isoformat()). Handlers that return it directly
+    also skip FastAPI's jsonable_encoder pass over the payload.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+def camel_case(label: str) -> str:
+    head, *rest = label.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def map_rows(rows) -> list[dict]:
+    """Rows as dicts keyed by their camelCased column labels"""
+    if not rows:
+        return []
+    keys = [camel_case(label) for label in rows[0]._fields]
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,4 @@
+-- Keyset pagination of GET /api/requests on (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_request_created_keyset
+    ON MaintenanceRequest(created_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
@@ -0,0 +1,12 @@
+-- Delta sync of GET /api/requests and /api/equipment (?updated_since=):
+-- changed rows are found via updated_at, tombstones via deleted_at
+CREATE INDEX IF NOT EXISTS idx_request_updated_at
+    ON MaintenanceRequest(updated_at);
+CREATE INDEX IF NOT EXISTS idx_request_deleted_at
+    ON MaintenanceRequest(deleted_at)
+    WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_updated_at
+    ON Equipment(updated_at);
+CREATE INDEX IF NOT EXISTS idx_equipment_deleted_at
+    ON Equipment(deleted_at)
+    WHERE deleted_at IS NOT NULL;
@@ -0,0 +1,51 @@
+-- Full-text search over requests and their comments (GET /api/requests/search)
+ALTER TABLE MaintenanceRequest ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+ALTER TABLE RequestComment ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', comment)) STORED;
+
+-- A request's search vector covers its subject (A), equipment name and serial (B)
+-- and description (C)
+CREATE OR REPLACE FUNCTION maintenancerequest_search_vector() RETURNS trigger AS $$
+DECLARE
+    equipment_name TEXT;
+    equipment_serial TEXT;
+BEGIN
+    SELECT name, serial_number INTO equipment_name, equipment_serial
+    FROM Equipment WHERE id = NEW.equipment_id;
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.subject, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(equipment_name, '') || ' ' || COALESCE(equipment_serial, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_request_search_vector ON MaintenanceRequest;
+CREATE TRIGGER trg_request_search_vector
+    BEFORE INSERT OR UPDATE OF subject, description, equipment_id ON MaintenanceRequest
+    FOR EACH ROW EXECUTE FUNCTION maintenancerequest_search_vector();
+
+-- Renaming equipment re-runs the request trigger for its requests
+CREATE OR REPLACE FUNCTION equipment_refresh_request_search() RETURNS trigger AS $$
+BEGIN
+    UPDATE MaintenanceRequest SET equipment_id = equipment_id WHERE equipment_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_equipment_request_search ON Equipment;
+CREATE TRIGGER trg_equipment_request_search
+    AFTER UPDATE OF name, serial_number ON Equipment
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.serial_number IS DISTINCT FROM NEW.serial_number)
+    EXECUTE FUNCTION equipment_refresh_request_search();
+
+-- Backfill existing requests through the trigger
+UPDATE MaintenanceRequest SET equipment_id = equipment_id WHERE search_vector IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_request_search
+    ON MaintenanceRequest USING GIN (search_vector)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_comment_search
+    ON RequestComment USING GIN (search_vector)
+    WHERE deleted_at IS NULL;
@@ -0,0 +1,5 @@
+-- Kanban board (GET /api/requests/board) ranks each status column on
+-- (created_at, id); also serves GET /api/requests?status= pages
+CREATE INDEX IF NOT EXISTS idx_request_status_keyset
+    ON MaintenanceRequest(status, created_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
@@ -0,0 +1,41 @@
+-- Per-table change counters behind the API's ETags (conditional GET)
+CREATE TABLE IF NOT EXISTS TableVersion (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO TableVersion (table_name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = TableVersion.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_version ON "User";
+CREATE TRIGGER trg_user_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "User"
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_maintenanceteam_version ON MaintenanceTeam;
+CREATE TRIGGER trg_maintenanceteam_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON MaintenanceTeam
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_teammember_version ON TeamMember;
+CREATE TRIGGER trg_teammember_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON TeamMember
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_equipment_version ON Equipment;
+CREATE TRIGGER trg_equipment_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON Equipment
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_maintenancerequest_version ON MaintenanceRequest;
+CREATE TRIGGER trg_maintenancerequest_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON MaintenanceRequest
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_requeststatuslog_version ON RequestStatusLog;
+CREATE TRIGGER trg_requeststatuslog_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON RequestStatusLog
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_requestcomment_version ON RequestComment;
+CREATE TRIGGER trg_requestcomment_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON RequestComment
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
@@ -0,0 +1,23 @@
+-- Paginated, sortable equipment list (GET /api/equipment): one keyset index per
+-- whitelisted sort key, plus prefix indexes for the name/serial filter
+CREATE INDEX IF NOT EXISTS idx_equipment_created_keyset
+    ON Equipment(created_at DESC, id DESC)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_name_keyset
+    ON Equipment(name, id)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_serial_keyset
+    ON Equipment(serial_number, id)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_warranty_keyset
+    ON Equipment((COALESCE(warranty_expiry, DATE '9999-12-31')), id)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_department_keyset
+    ON Equipment((COALESCE(department, '')), id)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_name_prefix
+    ON Equipment(lower(name) text_pattern_ops)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_serial_prefix
+    ON Equipment(lower(serial_number) text_pattern_ops)
+    WHERE deleted_at IS NULL;
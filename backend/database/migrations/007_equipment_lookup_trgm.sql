@@ -0,0 +1,9 @@
+-- Equipment autocomplete (GET /api/equipment/lookup): trigram indexes for fuzzy
+-- name/serial matching; prefix matching uses the indexes from 006
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_equipment_name_trgm
+    ON Equipment USING GIN (lower(name) gin_trgm_ops)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_equipment_serial_trgm
+    ON Equipment USING GIN (lower(serial_number) gin_trgm_ops)
+    WHERE deleted_at IS NULL;
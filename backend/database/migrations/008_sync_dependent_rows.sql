@@ -0,0 +1,53 @@
+-- Delta sync (updated_since) only sees rows whose own updated_at moved, but list
+-- rows also carry names joined from other tables. When one of those names
+-- changes, stamp updated_at on the rows that display it.
+
+-- Renaming equipment re-runs the request trigger for its requests and marks them changed
+CREATE OR REPLACE FUNCTION equipment_refresh_request_search() RETURNS trigger AS $$
+BEGIN
+    UPDATE MaintenanceRequest SET equipment_id = equipment_id, updated_at = NOW()
+    WHERE equipment_id = NEW.id AND deleted_at IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Team names show on requests and equipment
+CREATE OR REPLACE FUNCTION maintenanceteam_touch_dependents() RETURNS trigger AS $$
+BEGIN
+    UPDATE MaintenanceRequest SET updated_at = NOW()
+    WHERE maintenance_team_id = NEW.id AND deleted_at IS NULL;
+    UPDATE Equipment SET updated_at = NOW()
+    WHERE maintenance_team_id = NEW.id AND deleted_at IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_maintenanceteam_touch_dependents ON MaintenanceTeam;
+CREATE TRIGGER trg_maintenanceteam_touch_dependents
+    AFTER UPDATE OF name ON MaintenanceTeam
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION maintenanceteam_touch_dependents();
+
+-- User names show on requests (technician, creator) and equipment (default technician)
+CREATE OR REPLACE FUNCTION user_touch_dependents() RETURNS trigger AS $$
+BEGIN
+    UPDATE MaintenanceRequest SET updated_at = NOW()
+    WHERE (assigned_technician_id = NEW.id OR created_by = NEW.id) AND deleted_at IS NULL;
+    UPDATE Equipment SET updated_at = NOW()
+    WHERE default_technician_id = NEW.id AND deleted_at IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_touch_dependents ON "User";
+CREATE TRIGGER trg_user_touch_dependents
+    AFTER UPDATE OF name ON "User"
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION user_touch_dependents();
+
+-- The user lookups above (the other foreign keys are already indexed)
+CREATE INDEX IF NOT EXISTS idx_request_technician ON MaintenanceRequest(assigned_technician_id);
+CREATE INDEX IF NOT EXISTS idx_request_created_by ON MaintenanceRequest(created_by);
+CREATE INDEX IF NOT EXISTS idx_equipment_technician ON Equipment(default_technician_id);
@@ -92,7 +92,8 @@ CREATE TABLE MaintenanceRequest (
     created_by INT NOT NULL REFERENCES "User"(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP,
-    deleted_at TIMESTAMP
+    deleted_at TIMESTAMP,
+    search_vector TSVECTOR -- maintained by trg_request_search_vector
 );
 
 -- ---------- REQUEST STATUS LOG ----------
@@ -112,7 +113,8 @@ CREATE TABLE RequestComment (
     comment TEXT NOT NULL,
     commented_by INT REFERENCES "User"(id),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    deleted_at TIMESTAMP
+    deleted_at TIMESTAMP,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', comment)) STORED
 );
 
 -- ---------- INDEXES ----------
@@ -120,6 +122,142 @@ CREATE INDEX idx_equipment_team ON Equipment(maintenance_team_id);
 CREATE INDEX idx_request_status ON MaintenanceRequest(status);
 CREATE INDEX idx_request_equipment ON MaintenanceRequest(equipment_id);
 CREATE INDEX idx_request_team ON MaintenanceRequest(maintenance_team_id);
+CREATE INDEX idx_request_technician ON MaintenanceRequest(assigned_technician_id);
+CREATE INDEX idx_request_created_by ON MaintenanceRequest(created_by);
+CREATE INDEX idx_equipment_technician ON Equipment(default_technician_id);
+-- Keyset pagination of the request list (newest first)
+CREATE INDEX idx_request_created_keyset ON MaintenanceRequest(created_at DESC, id DESC) WHERE deleted_at IS NULL;
+-- Kanban board columns and status-filtered list pages
+CREATE INDEX idx_request_status_keyset ON MaintenanceRequest(status, created_at DESC, id DESC) WHERE deleted_at IS NULL;
+-- Delta sync (?updated_since=): changed rows and tombstones
+CREATE INDEX idx_request_updated_at ON MaintenanceRequest(updated_at);
+CREATE INDEX idx_request_deleted_at ON MaintenanceRequest(deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX idx_equipment_updated_at ON Equipment(updated_at);
+CREATE INDEX idx_equipment_deleted_at ON Equipment(deleted_at) WHERE deleted_at IS NOT NULL;
+-- Equipment list: keyset per sort key, name/serial prefix search
+CREATE INDEX idx_equipment_created_keyset ON Equipment(created_at DESC, id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX idx_equipment_name_keyset ON Equipment(name, id) WHERE deleted_at IS NULL;
+CREATE INDEX idx_equipment_serial_keyset ON Equipment(serial_number, id) WHERE deleted_at IS NULL;
+CREATE INDEX idx_equipment_warranty_keyset ON Equipment((COALESCE(warranty_expiry, DATE '9999-12-31')), id) WHERE deleted_at IS NULL;
+CREATE INDEX idx_equipment_department_keyset ON Equipment((COALESCE(department, '')), id) WHERE deleted_at IS NULL;
+CREATE INDEX idx_equipment_name_prefix ON Equipment(lower(name) text_pattern_ops) WHERE deleted_at IS NULL;
+CREATE INDEX idx_equipment_serial_prefix ON Equipment(lower(serial_number) text_pattern_ops) WHERE deleted_at IS NULL;
+-- Equipment autocomplete (GET /api/equipment/lookup): fuzzy name/serial matching
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_equipment_name_trgm ON Equipment USING GIN (lower(name) gin_trgm_ops) WHERE deleted_at IS NULL;
+CREATE INDEX idx_equipment_serial_trgm ON Equipment USING GIN (lower(serial_number) gin_trgm_ops) WHERE deleted_at IS NULL;
+-- Full-text search (GET /api/requests/search)
+CREATE INDEX idx_request_search ON MaintenanceRequest USING GIN (search_vector) WHERE deleted_at IS NULL;
+CREATE INDEX idx_comment_search ON RequestComment USING GIN (search_vector) WHERE deleted_at IS NULL;
+
+-- ---------- FULL-TEXT SEARCH ----------
+-- A request's search vector covers its subject (A), equipment name and serial (B)
+-- and description (C); comments carry their own generated vector
+CREATE FUNCTION maintenancerequest_search_vector() RETURNS trigger AS $$
+DECLARE
+    equipment_name TEXT;
+    equipment_serial TEXT;
+BEGIN
+    SELECT name, serial_number INTO equipment_name, equipment_serial
+    FROM Equipment WHERE id = NEW.equipment_id;
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.subject, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(equipment_name, '') || ' ' || COALESCE(equipment_serial, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_request_search_vector
+    BEFORE INSERT OR UPDATE OF subject, description, equipment_id ON MaintenanceRequest
+    FOR EACH ROW EXECUTE FUNCTION maintenancerequest_search_vector();
+
+-- Renaming equipment re-runs the request trigger for its requests and marks
+-- them changed for delta sync
+CREATE FUNCTION equipment_refresh_request_search() RETURNS trigger AS $$
+BEGIN
+    UPDATE MaintenanceRequest SET equipment_id = equipment_id, updated_at = NOW()
+    WHERE equipment_id = NEW.id AND deleted_at IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_equipment_request_search
+    AFTER UPDATE OF name, serial_number ON Equipment
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.serial_number IS DISTINCT FROM NEW.serial_number)
+    EXECUTE FUNCTION equipment_refresh_request_search();
+
+-- ---------- DELTA SYNC ----------
+-- List rows carry names joined from other tables; when one changes, stamp
+-- updated_at on the rows that display it so updated_since delivers them
+CREATE FUNCTION maintenanceteam_touch_dependents() RETURNS trigger AS $$
+BEGIN
+    UPDATE MaintenanceRequest SET updated_at = NOW()
+    WHERE maintenance_team_id = NEW.id AND deleted_at IS NULL;
+    UPDATE Equipment SET updated_at = NOW()
+    WHERE maintenance_team_id = NEW.id AND deleted_at IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_maintenanceteam_touch_dependents
+    AFTER UPDATE OF name ON MaintenanceTeam
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION maintenanceteam_touch_dependents();
+
+CREATE FUNCTION user_touch_dependents() RETURNS trigger AS $$
+BEGIN
+    UPDATE MaintenanceRequest SET updated_at = NOW()
+    WHERE (assigned_technician_id = NEW.id OR created_by = NEW.id) AND deleted_at IS NULL;
+    UPDATE Equipment SET updated_at = NOW()
+    WHERE default_technician_id = NEW.id AND deleted_at IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_user_touch_dependents
+    AFTER UPDATE OF name ON "User"
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION user_touch_dependents();
+
+-- ---------- TABLE VERSIONS ----------
+-- Change log behind the API's ETags: every statement that writes one of these
+-- tables appends a row inside the writing transaction, and a table's version is
+-- the sum of its rows' changes. Appending takes no shared row lock, so writers
+-- never queue (or deadlock) on a counter; the app periodically folds each
+-- table's rows into one (core/etag.py), which leaves the sums unchanged.
+CREATE TABLE TableVersionLog (
+    id BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    changes BIGINT NOT NULL DEFAULT 1
+);
+
+CREATE INDEX idx_tableversionlog_table ON TableVersionLog(table_name) INCLUDE (changes);
+
+CREATE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO TableVersionLog (table_name) VALUES (TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_user_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "User"
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER trg_maintenanceteam_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON MaintenanceTeam
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER trg_teammember_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON TeamMember
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER trg_equipment_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON Equipment
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER trg_maintenancerequest_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON MaintenanceRequest
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER trg_requeststatuslog_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON RequestStatusLog
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+CREATE TRIGGER trg_requestcomment_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON RequestComment
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
 
 -- ---------- LOGIN HISTORY ----------
 CREATE TABLE LoginHistory (
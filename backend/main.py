@@ -1,14 +1,43 @@
 
-from fastapi import Depends, FastAPI
+from contextlib import asynccontextmanager
 
-from .api import auth, equipment, teams, maintenance, reports
+from fastapi import Depends, FastAPI, Request
+
+from .api import auth, equipment, events, teams, maintenance, reports
+from .core.config import settings
+from .core.database import RECENT_WRITE_COOKIE, replicas
+from .core.etag import table_version_compactor
+from .core.metrics import db_metrics, tag_route
+from .core.executors import shutdown_executors
 from .core.security import require_role
+from .core.serialization import ORJSONResponse
+from .services.audit_service import login_history_writer
+from .services.change_feed import change_feed
+from .services.dispatch import dispatch_index
+from .services.equipment_index import equipment_index
 from fastapi.middleware.cors import CORSMiddleware
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    login_history_writer.start()
+    table_version_compactor.start()
+    yield
+    await table_version_compactor.stop()
+    await equipment_index.stop()
+    await dispatch_index.stop()
+    await change_feed.stop()
+    login_history_writer.stop()
+    shutdown_executors()
+
+
 app = FastAPI(
     title="GearGuard API",
     description="Backend services for the GearGuard Maintenance Management System.",
     version="0.1.0",
+    lifespan=lifespan,
+    dependencies=[Depends(tag_route)],
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -20,12 +49,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def mark_recent_writes(request: Request, call_next):
+    """Pin a client's reads to the primary for a few seconds after it changes data"""
+    response = await call_next(request)
+    if (
+        request.method in ("POST", "PUT", "PATCH", "DELETE")
+        and request.url.path.startswith("/api/")
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            key=RECENT_WRITE_COOKIE,
+            value="1",
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            secure=settings.SECURE_COOKIES,
+            samesite="lax",
+        )
+    return response
+
+
 # Register all routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(equipment.router, prefix="/api", tags=["Equipment"])
 app.include_router(teams.router, prefix="/api", tags=["Teams"])
 app.include_router(maintenance.router, prefix="/api", tags=["Maintenance"])
 app.include_router(reports.router, prefix="/api", tags=["Reports & Dashboard"])
+app.include_router(events.router, prefix="/api", tags=["Events"])
 
 
 @app.get("/")
@@ -34,10 +84,32 @@ def read_root():
 
 
 from .core.database import get_db
-from .core.security import require_role
+from .core.security import require_role, token_cache
+from .services.user_service import principal_cache
 from sqlalchemy.orm import Session
 
 @app.get("/admin")
 def read_admin_dashboard(db: Session = Depends(get_db), current_user: dict = Depends(require_role("admin"))):
     return {"message": f"Welcome to the admin dashboard, {current_user.email}!"}
 
+
+@app.get("/admin/cache-stats")
+def read_cache_stats(current_user: dict = Depends(require_role("admin"))):
+    """Per-worker cache sizes and hit rates, for sizing the caches"""
+    return {
+        "tokenCache": token_cache.stats(),
+        "principalCache": principal_cache.stats(),
+        "equipmentIndex": equipment_index.stats(),
+        "dispatchIndex": dispatch_index.stats(),
+    }
+
+
+@app.get("/admin/db-stats")
+def read_db_stats(reset: bool = False, current_user: dict = Depends(require_role("admin"))):
+    """Per-worker connection pool usage, checkout waits and statement latency by route"""
+    stats = db_metrics.snapshot()
+    stats["replicas"] = replicas.stats()
+    if reset:
+        db_metrics.reset()
+    return stats
+
@@ -0,0 +1,30 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class EquipmentFilter(BaseModel):
+    category: Optional[str] = None
+    department: Optional[str] = None
+    maintenance_team_id: Optional[int] = None
+    is_scrapped: Optional[bool] = None
+
+
+class EquipmentChanges(BaseModel):
+    # Field names are the equipment column names they set
+    category: Optional[str] = None
+    purchase_date: Optional[date] = None
+    warranty_expiry: Optional[date] = None
+    location: Optional[str] = None
+    department: Optional[str] = None
+    maintenance_team_id: Optional[int] = None
+    default_technician_id: Optional[int] = None
+    is_scrapped: Optional[bool] = None
+
+
+class BulkEquipmentUpdate(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000)
+    filter: Optional[EquipmentFilter] = None
+    changes: EquipmentChanges
+    close_open_requests: bool = False
@@ -4,7 +4,7 @@ from sqlalchemy.sql import func
 from ..core.database import Base
 
 class LoginHistory(Base):
-    __tablename__ = "LoginHistory"
+    __tablename__ = "loginhistory"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('User.id'), nullable=False)
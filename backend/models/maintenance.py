@@ -0,0 +1,13 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class StatusTransition(BaseModel):
+    id: int
+    status: str
+    expected_status: Optional[str] = None
+
+
+class BulkStatusUpdate(BaseModel):
+    transitions: List[StatusTransition] = Field(..., min_length=1, max_length=500)
@@ -0,0 +1,8 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class TeamMembersUpdate(BaseModel):
+    # The complete desired member set; users not listed are removed
+    user_ids: List[int] = Field(..., max_length=1000)
@@ -1,10 +1,109 @@
+import logging
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..core.config import settings
+from ..core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
 
 def create_login_history(db: Session, user_id: int, ip_address: str):
     db_login_history = models.login_history.LoginHistory(user_id=user_id, ip_address=ip_address)
     db.add(db_login_history)
     db.commit()
     db.refresh(db_login_history)
-    return db_login_history
\ No newline at end of file
+    return db_login_history
+
+
+class LoginHistoryWriter:
+    """
+    Buffers login history rows in memory and writes them with one multi-row INSERT
+    whenever batch_size rows are waiting or flush_interval seconds have passed.
+    The queue is bounded; when it is full new rows are dropped and counted
+    rather than slowing down the login path.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="login-history-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """Stop the writer after flushing everything still queued"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def enqueue(self, user_id: int, ip_address: str | None):
+        row = {"user_id": user_id, "ip_address": ip_address}
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def _next_batch(self) -> list:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: list):
+        db = SessionLocal()
+        try:
+            db.execute(insert(models.login_history.LoginHistory).values(batch))
+            db.commit()
+            self.written += len(batch)
+        except Exception:
+            db.rollback()
+            self.failed += len(batch)
+            logger.exception("Failed to write %d login history rows", len(batch))
+        finally:
+            db.close()
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+login_history_writer = LoginHistoryWriter(
+    batch_size=settings.LOGIN_HISTORY_BATCH_SIZE,
+    flush_interval=settings.LOGIN_HISTORY_FLUSH_SECONDS,
+    max_queue=settings.LOGIN_HISTORY_MAX_QUEUE,
+)
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "gearguard_changes"
+# pg_notify rejects payloads of this many bytes or more, aborting the transaction
+MAX_PAYLOAD_BYTES = 8000
+RESYNC_PAYLOAD = json.dumps({"entity": "feed", "action": "resync"})
+# Ids per event for callers that report many rows; 500 ids fit comfortably in a payload
+CHANGE_EVENT_MAX_IDS = 500
+
+
+async def publish_change(db: AsyncSession, entity: str, action: str, **data):
+    """
+    Queue a change event on the session's transaction. PostgreSQL delivers it to
+    every listening worker on commit and drops it on rollback. An event too large
+    for NOTIFY is replaced by a resync, so the caller's write still commits.
+    """
+    payload = json.dumps({"entity": entity, "action": action, **data}, default=str)
+    if len(payload.encode()) >= MAX_PAYLOAD_BYTES:
+        logger.warning("Change event %s/%s is %d bytes, sending resync instead", entity, action, len(payload.encode()))
+        payload = RESYNC_PAYLOAD
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+class ChangeFeed:
+    """
+    Holds one LISTEN connection per worker and fans each notification out to the
+    in-process subscribers (one bounded queue per open event stream).
+    """
+
+    def __init__(self, queue_size: int, reconnect_seconds: float):
+        self.queue_size = queue_size
+        self.reconnect_seconds = reconnect_seconds
+        self._subscribers = set()
+        self._task = None
+
+    def subscribe(self) -> asyncio.Queue:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _broadcast(self, event: dict):
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A client that fell this far behind has to refetch anyway
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"entity": "feed", "action": "resync"})
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed change event: %s", payload[:200])
+            return
+        self._broadcast(event)
+
+    async def _listen(self):
+        dsn = async_engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError):
+                logger.exception("Change feed could not connect, retrying")
+                await asyncio.sleep(self.reconnect_seconds)
+                continue
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(CHANNEL, self._on_notify)
+                await closed.wait()
+            finally:
+                await connection.close()
+
+            # Events may have been missed while disconnected
+            self._broadcast({"entity": "feed", "action": "resync"})
+            await asyncio.sleep(self.reconnect_seconds)
+
+
+change_feed = ChangeFeed(
+    queue_size=settings.CHANGE_FEED_QUEUE_SIZE,
+    reconnect_seconds=settings.CHANGE_FEED_RECONNECT_SECONDS,
+)
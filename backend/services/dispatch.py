@@ -0,0 +1,240 @@
+import asyncio
+import heapq
+import time
+from collections import Counter
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from .change_feed import change_feed
+from .request_service import OPEN_STATUSES
+
+
+class DispatchIndex:
+    """
+    Per-worker technician load index for auto-assigning requests.
+
+    A technician's load is their number of open (new/in_progress) requests plus
+    assignments reserved by this worker but not yet committed. Each team has a
+    min-heap of (load, technician_id); a load change pushes a fresh entry and
+    outdated ones are dropped when they reach the top, so picking the least
+    loaded technician is O(log n).
+
+    Loads follow the change feed: creations add to them, moves out of an open
+    status and deletions subtract. Events that cannot be applied exactly (bulk
+    moves, imports, reassignments, missed events) mark the index stale, and it
+    is rebuilt from the database on next use or every reconcile_seconds.
+    Membership events reload only the affected team.
+    """
+
+    def __init__(self, reconcile_seconds: float):
+        self.reconcile_seconds = reconcile_seconds
+        self._open = {}
+        self._counts = Counter()
+        self._pending = Counter()
+        self._members = {}
+        self._technician_teams = {}
+        self._heaps = {}
+        self._stale_teams = set()
+        self._loaded_at = 0.0
+        self._stale = True
+        self._replay = None
+        self._lock = asyncio.Lock()
+        self._queue = None
+        self._task = None
+
+    # ---------- Load bookkeeping ----------
+
+    def _load(self, technician_id: int) -> int:
+        return self._counts[technician_id] + self._pending[technician_id]
+
+    def _push(self, technician_id: int):
+        load = self._load(technician_id)
+        for team_id in self._technician_teams.get(technician_id, ()):
+            heap = self._heaps[team_id]
+            heapq.heappush(heap, (load, technician_id))
+            # Outdated entries only leave the heap from the top; rebuild before they pile up
+            if len(heap) > 4 * len(self._members[team_id]) + 16:
+                self._rebuild_heap(team_id)
+
+    def _rebuild_heap(self, team_id: int):
+        heap = [(self._load(technician_id), technician_id) for technician_id in self._members[team_id]]
+        heapq.heapify(heap)
+        self._heaps[team_id] = heap
+
+    def _track(self, request_id: int, technician_id: int):
+        if technician_id is None or request_id in self._open:
+            return
+        self._open[request_id] = technician_id
+        self._counts[technician_id] += 1
+        self._push(technician_id)
+
+    def _untrack(self, request_id: int):
+        technician_id = self._open.pop(request_id, None)
+        if technician_id is None:
+            return
+        self._counts[technician_id] -= 1
+        self._push(technician_id)
+
+    def _set_members(self, team_id: int, technician_ids: set):
+        for technician_id in self._members.get(team_id, ()):
+            self._technician_teams[technician_id].discard(team_id)
+        self._members[team_id] = technician_ids
+        for technician_id in technician_ids:
+            self._technician_teams.setdefault(technician_id, set()).add(team_id)
+        self._rebuild_heap(team_id)
+
+    # ---------- Change events ----------
+
+    def apply(self, event: dict):
+        """Update loads from one change feed event"""
+        if self._replay is not None:
+            self._replay.append(event)
+
+        entity, action = event.get("entity"), event.get("action")
+        if entity == "feed":
+            self._stale = True
+        elif entity == "team":
+            self._stale_teams.add(event.get("id"))
+        elif entity != "request":
+            return
+        elif action == "created":
+            self._track(event["id"], event.get("technicianId"))
+        elif action == "deleted":
+            self._untrack(event["id"])
+        elif action == "status_changed" and "id" in event:
+            if event.get("newStatus") not in OPEN_STATUSES:
+                self._untrack(event["id"])
+            elif event.get("oldStatus") not in OPEN_STATUSES:
+                # Reopened; its technician is only known to the database
+                self._stale = True
+        elif action == "status_changed" and event.get("newStatus") not in (None, *OPEN_STATUSES):
+            for request_id in event.get("ids", ()):
+                self._untrack(request_id)
+        elif action in ("status_changed", "imported") or (action == "updated" and "technicianId" in event):
+            self._stale = True
+
+    async def _consume(self):
+        while True:
+            self.apply(await self._queue.get())
+
+    def _ensure_listening(self):
+        if self._task is None or self._task.done():
+            self._queue = change_feed.subscribe()
+            self._task = asyncio.create_task(self._consume())
+            # Events before this point were not seen
+            self._stale = True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            change_feed.unsubscribe(self._queue)
+            self._task = None
+
+    # ---------- Database sync ----------
+
+    async def _reload(self, db: AsyncSession):
+        # Events arriving during the queries are replayed on top of the snapshot
+        self._replay = []
+        try:
+            members = (await db.execute(text("""
+                SELECT tm.team_id, tm.user_id
+                FROM teammember tm
+                JOIN "User" u ON u.id = tm.user_id
+                JOIN maintenanceteam mt ON mt.id = tm.team_id
+                WHERE tm.deleted_at IS NULL AND mt.deleted_at IS NULL
+                  AND u.deleted_at IS NULL AND u.role = 'technician'
+            """))).fetchall()
+            open_requests = (await db.execute(text("""
+                SELECT id, assigned_technician_id
+                FROM maintenancerequest
+                WHERE deleted_at IS NULL
+                  AND assigned_technician_id IS NOT NULL
+                  AND status = ANY(CAST(:statuses AS VARCHAR[]))
+            """), {"statuses": list(OPEN_STATUSES)})).fetchall()
+        except BaseException:
+            self._replay = None
+            raise
+
+        replay, self._replay = self._replay, None
+        self._stale = False
+        self._stale_teams.clear()
+
+        self._open = {row.id: row.assigned_technician_id for row in open_requests}
+        self._counts = Counter(self._open.values())
+        self._members, self._technician_teams, self._heaps = {}, {}, {}
+        teams = {}
+        for row in members:
+            teams.setdefault(row.team_id, set()).add(row.user_id)
+        for team_id, technician_ids in teams.items():
+            self._set_members(team_id, technician_ids)
+        self._loaded_at = time.monotonic()
+
+        for event in replay:
+            self.apply(event)
+
+    async def _reload_team(self, db: AsyncSession, team_id: int):
+        rows = (await db.execute(text("""
+            SELECT tm.user_id
+            FROM teammember tm
+            JOIN "User" u ON u.id = tm.user_id
+            JOIN maintenanceteam mt ON mt.id = tm.team_id
+            WHERE tm.team_id = :team_id
+              AND tm.deleted_at IS NULL AND mt.deleted_at IS NULL
+              AND u.deleted_at IS NULL AND u.role = 'technician'
+        """), {"team_id": team_id})).fetchall()
+        self._set_members(team_id, {row.user_id for row in rows})
+
+    async def _refresh(self, db: AsyncSession, team_id: int):
+        self._ensure_listening()
+        async with self._lock:
+            if self._stale or time.monotonic() - self._loaded_at >= self.reconcile_seconds:
+                await self._reload(db)
+            elif team_id in self._stale_teams:
+                self._stale_teams.discard(team_id)
+                await self._reload_team(db, team_id)
+
+    # ---------- Dispatch ----------
+
+    async def reserve(self, db: AsyncSession, team_id: int) -> int | None:
+        """
+        Least-loaded technician of the team, counted as one request busier until
+        release(), or None if the team has no technicians
+        """
+        await self._refresh(db, team_id)
+
+        heap = self._heaps.get(team_id)
+        members = self._members.get(team_id, ())
+        while heap:
+            load, technician_id = heap[0]
+            if technician_id in members and load == self._load(technician_id):
+                self._pending[technician_id] += 1
+                self._push(technician_id)
+                return technician_id
+            heapq.heappop(heap)
+        return None
+
+    def release(self, technician_id: int):
+        """Drop a reservation once its request is committed (and tracked) or abandoned"""
+        self._pending[technician_id] -= 1
+        self._push(technician_id)
+
+    def track(self, request_id: int, technician_id: int | None):
+        """Count a request this worker just committed, ahead of its change event"""
+        self._track(request_id, technician_id)
+
+    def stats(self) -> dict:
+        return {
+            "teams": len(self._members),
+            "openRequests": len(self._open),
+            "pending": sum(self._pending.values()),
+            "stale": self._stale,
+        }
+
+
+dispatch_index = DispatchIndex(reconcile_seconds=settings.DISPATCH_RECONCILE_SECONDS)
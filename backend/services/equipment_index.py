@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+
+from sqlalchemy import text
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..core.etag import table_versions_etag
+
+logger = logging.getLogger(__name__)
+
+
+def _build(rows) -> tuple[list, list]:
+    """Sorted (keys, entries) over lowercased names and serial numbers"""
+    pairs = []
+    for row in rows:
+        entry = {
+            "id": row.id,
+            "name": row.name,
+            "serialNumber": row.serial_number,
+            "category": row.category,
+            "location": row.location,
+            "isScrapped": row.is_scrapped,
+            "match": "prefix",
+        }
+        pairs.append((row.name.lower(), row.id, entry))
+        pairs.append((row.serial_number.lower(), row.id, entry))
+    pairs.sort(key=lambda pair: (pair[0], pair[1]))
+    return [key for key, _, _ in pairs], [entry for _, _, entry in pairs]
+
+
+class EquipmentPrefixIndex:
+    """
+    Per-worker sorted index of lowercased equipment names and serial numbers for
+    autocomplete prefix lookups without a database round trip.
+
+    Lookups never wait on a load: every refresh_seconds one of them starts a
+    background refresh on its own session, which reads the equipment table
+    version and rebuilds only if equipment changed. The sort runs in a worker
+    thread and the new index is swapped in whole, so lookups keep using the
+    previous one meanwhile. Until the first load finishes, or while there are
+    more than max_rows live items (checked with a count before any rows are
+    read), lookups return None and the caller falls back to SQL.
+    """
+
+    def __init__(self, refresh_seconds: float, max_rows: int):
+        self.refresh_seconds = refresh_seconds
+        self.max_rows = max_rows
+        self._keys = []
+        self._entries = []
+        self._version = None
+        self._checked_at = None
+        self._available = False
+        self._task = None
+
+    async def _reload(self, db, version):
+        count = (await db.execute(
+            text("SELECT COUNT(*) FROM equipment WHERE deleted_at IS NULL")
+        )).scalar()
+
+        if count > self.max_rows:
+            keys, entries, available = [], [], False
+        else:
+            # The limit guards against rows added since the count
+            rows = (await db.execute(text("""
+                SELECT id, name, serial_number, category, location, is_scrapped
+                FROM equipment
+                WHERE deleted_at IS NULL
+                LIMIT :limit
+            """), {"limit": self.max_rows + 1})).fetchall()
+            if len(rows) > self.max_rows:
+                keys, entries, available = [], [], False
+            else:
+                keys, entries = await asyncio.to_thread(_build, rows)
+                available = True
+
+        self._keys, self._entries, self._available = keys, entries, available
+        self._version = version
+
+    async def _refresh(self):
+        try:
+            async with AsyncSessionLocal() as db:
+                version = await table_versions_etag(db, ("equipment",))
+                if version != self._version:
+                    await self._reload(db, version)
+        except Exception:
+            logger.exception("Equipment index refresh failed")
+
+    def _schedule_refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._checked_at = now
+        self._task = asyncio.create_task(self._refresh())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def lookup(self, prefix: str, limit: int) -> list[dict] | None:
+        """Up to limit items whose name or serial starts with prefix, or None when the index is unavailable"""
+        self._schedule_refresh()
+        if not self._available:
+            return None
+
+        keys, entries = self._keys, self._entries
+        prefix = prefix.lower()
+        results = {}
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and len(results) < limit:
+            if not keys[position].startswith(prefix):
+                break
+            entry = entries[position]
+            results.setdefault(entry["id"], entry)
+            position += 1
+        return list(results.values())
+
+    def stats(self) -> dict:
+        return {
+            "available": self._available,
+            "keys": len(self._keys),
+            "version": self._version,
+            "refreshing": self._task is not None and not self._task.done(),
+        }
+
+
+equipment_index = EquipmentPrefixIndex(
+    refresh_seconds=settings.EQUIPMENT_INDEX_REFRESH_SECONDS,
+    max_rows=settings.EQUIPMENT_INDEX_MAX_ROWS,
+)
@@ -0,0 +1,271 @@
+import csv
+import json
+from collections import deque
+from datetime import date
+
+from fastapi import HTTPException, Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+COPY_BATCH_SIZE = 1000
+MAX_RECORD_BYTES = 1024 * 1024
+MAX_REPORTED_ERRORS = 1000
+
+
+# ---------- Field parsers ----------
+# Each takes the raw value (str from CSV, any JSON scalar from NDJSON) and
+# returns the typed value or raises ValueError with a message for the caller.
+
+def text_field(max_length: int | None = None, required: bool = False):
+    def parse(raw):
+        value = None if raw is None else str(raw).strip()
+        if not value:
+            if required:
+                raise ValueError("is required")
+            return None
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f"must be at most {max_length} characters")
+        return value
+    return parse
+
+
+def int_field(required: bool = False):
+    def parse(raw):
+        if raw is None or str(raw).strip() == "":
+            if required:
+                raise ValueError("is required")
+            return None
+        try:
+            return int(raw)
+        except (TypeError, ValueError):
+            raise ValueError("must be an integer")
+    return parse
+
+
+def date_field():
+    def parse(raw):
+        if raw is None or str(raw).strip() == "":
+            return None
+        try:
+            return date.fromisoformat(str(raw).strip())
+        except ValueError:
+            raise ValueError("must be a date (YYYY-MM-DD)")
+    return parse
+
+
+def choice_field(choices, default=None):
+    def parse(raw):
+        if raw is None or str(raw).strip() == "":
+            return default
+        value = str(raw).strip()
+        if value not in choices:
+            raise ValueError(f"must be one of {', '.join(choices)}")
+        return value
+    return parse
+
+
+class ImportSpec:
+    """
+    Describes one importable entity: the temp staging table rows are COPYed into
+    and, per column, its SQL type and parser.
+    """
+
+    def __init__(self, staging_table: str, columns: list[tuple]):
+        self.staging_table = staging_table
+        self.columns = columns
+
+    @property
+    def column_names(self) -> list[str]:
+        return [name for name, _, _ in self.columns]
+
+    def create_staging_sql(self) -> str:
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type, _ in self.columns)
+        return f"CREATE TEMP TABLE {self.staging_table} (line_no INTEGER, {columns}, error TEXT) ON COMMIT DROP"
+
+    def parse(self, record: dict) -> tuple:
+        values = []
+        for name, _, parser in self.columns:
+            try:
+                values.append(parser(record.get(name)))
+            except ValueError as exc:
+                raise ValueError(f"{name} {exc}")
+        return tuple(values)
+
+
+class ImportReport:
+    def __init__(self):
+        self.processed = 0
+        self.errors = []
+        self.error_count = 0
+
+    def add_error(self, line_no: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "error": message})
+
+    def to_dict(self, inserted: int) -> dict:
+        self.errors.sort(key=lambda e: e["line"])
+        return {
+            "processed": self.processed,
+            "inserted": inserted,
+            "failed": self.error_count,
+            "errors": self.errors,
+            "errorsTruncated": self.error_count > len(self.errors),
+        }
+
+
+def _decode_line(line_no: int, line: bytes) -> str:
+    try:
+        # utf-8-sig drops a byte order mark at the start of the file
+        return line.decode("utf-8-sig" if line_no == 1 else "utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail=f"Line {line_no} is not valid UTF-8")
+
+
+async def _iter_lines(request: Request):
+    """Yield (line_no, text) from the request body without buffering more than one line"""
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, _decode_line(line_no, line)
+        if len(buffer) > MAX_RECORD_BYTES:
+            raise HTTPException(status_code=413, detail=f"Line {line_no + 1} is too long")
+    if buffer:
+        line_no += 1
+        yield line_no, _decode_line(line_no, buffer)
+
+
+class _NeedInput(Exception):
+    """The CSV reader asked for a line that has not arrived yet"""
+
+
+class _LineFeed:
+    """Iterator the CSV reader pulls lines from, filled as the body streams in"""
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.lines:
+            raise _NeedInput
+        return self.lines.popleft()
+
+
+async def iter_records(request: Request, fmt: str):
+    """
+    Yield (line_no, record dict or ValueError) for a streamed CSV (header row first)
+    or NDJSON body (one record per line). Blank lines are skipped. CSV fields may
+    span lines inside quotes; line_no is the line a record starts on.
+    """
+    if fmt == "ndjson":
+        async for line_no, line in _iter_lines(request):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_no, ValueError("is not valid JSON")
+                continue
+            if not isinstance(record, dict):
+                yield line_no, ValueError("must be a JSON object")
+                continue
+            yield line_no, record
+        return
+
+    # One reader parses the whole body. A record whose quoted field continues on
+    # the next line stops the reader with _NeedInput; its lines are kept and
+    # parsed again once the next line arrives (the reader restarts each record).
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    pending = []
+    pending_bytes = 0
+    start = 0
+    async for line_no, line in _iter_lines(request):
+        if not pending:
+            if not line.strip():
+                continue
+            start = line_no
+        pending.append(line + "\n")
+        pending_bytes += len(line) + 1
+        if pending_bytes > MAX_RECORD_BYTES:
+            raise HTTPException(status_code=413, detail=f"Record at line {start} is too long")
+
+        feed.lines = deque(pending)
+        try:
+            fields = next(reader)
+        except _NeedInput:
+            continue
+        except csv.Error as exc:
+            yield start, ValueError(f"is not valid CSV: {exc}")
+            pending, pending_bytes = [], 0
+            continue
+        pending, pending_bytes = [], 0
+
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if len(fields) != len(header):
+            yield start, ValueError(f"has {len(fields)} fields, expected {len(header)}")
+            continue
+        yield start, dict(zip(header, fields))
+
+    if pending:
+        yield start, ValueError("has a quoted field that is never closed")
+
+
+async def stage_import(db: AsyncSession, request: Request, fmt: str, spec: ImportSpec) -> ImportReport:
+    """
+    Validate a streamed upload row by row and COPY the valid rows into the spec's
+    temp staging table in batches, so memory stays flat whatever the file size.
+    Invalid rows are recorded on the returned report.
+    """
+    await db.execute(text(spec.create_staging_sql()))
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver = raw_connection.driver_connection
+    columns = ["line_no"] + spec.column_names
+
+    report = ImportReport()
+    batch = []
+    async for line_no, record in iter_records(request, fmt):
+        report.processed += 1
+        if isinstance(record, ValueError):
+            report.add_error(line_no, f"Line {record}")
+            continue
+        try:
+            batch.append((line_no,) + spec.parse(record))
+        except ValueError as exc:
+            report.add_error(line_no, str(exc))
+            continue
+        if len(batch) >= COPY_BATCH_SIZE:
+            await driver.copy_records_to_table(spec.staging_table, records=batch, columns=columns)
+            batch = []
+
+    if batch:
+        await driver.copy_records_to_table(spec.staging_table, records=batch, columns=columns)
+    return report
+
+
+async def collect_staging_errors(db: AsyncSession, spec: ImportSpec, report: ImportReport):
+    """Move errors flagged on staging rows during the merge onto the report"""
+    counted = (await db.execute(text(
+        f"SELECT COUNT(*) FROM {spec.staging_table} WHERE error IS NOT NULL"
+    ))).scalar()
+    rows = (await db.execute(text(f"""
+        SELECT line_no, error FROM {spec.staging_table}
+        WHERE error IS NOT NULL
+        ORDER BY line_no
+        LIMIT :limit
+    """), {"limit": MAX_REPORTED_ERRORS})).fetchall()
+    for row in rows:
+        report.add_error(row.line_no, row.error)
+    # Errors beyond the listed ones still count towards the total
+    report.error_count += counted - len(rows)
@@ -0,0 +1,16 @@
+REQUEST_STATUSES = ("new", "in_progress", "repaired", "scrap")
+
+# Statuses a request can still be worked on in
+OPEN_STATUSES = ("new", "in_progress")
+
+
+def status_transition_sql(new_status: str, alias: str = "maintenancerequest") -> str:
+    """
+    SET-clause body moving a maintenancerequest row to new_status (any SQL expression).
+    Stamps started_at on the first move to in_progress and completed_at on the
+    first move to repaired/scrap, so every status write path follows the same rules.
+    """
+    return f"""status = {new_status},
+            started_at = CASE WHEN {new_status} = 'in_progress' AND {alias}.started_at IS NULL THEN NOW() ELSE {alias}.started_at END,
+            completed_at = CASE WHEN {new_status} IN ('repaired', 'scrap') AND {alias}.completed_at IS NULL THEN NOW() ELSE {alias}.completed_at END,
+            updated_at = NOW()"""
@@ -0,0 +1,127 @@
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.pagination import decode_cursor, encode_cursor
+
+# updated_since value that starts a full sync
+BOOTSTRAP_TOKEN = "0"
+
+
+def _parse_timestamp(value):
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def parse_sync_token(token: str) -> tuple:
+    """
+    Split an updated_since token into (since, after_changed_at, after_id).
+    Bootstrap pages carry (start watermark, None, last id); delta pages carry
+    (since, last change time, last id); final tokens carry (watermark, None, None).
+    """
+    if token == BOOTSTRAP_TOKEN:
+        return None, None, None
+    since, after_changed_at, after_id = decode_cursor(token, 3)
+    if after_id is not None and not isinstance(after_id, int):
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    return _parse_timestamp(since), _parse_timestamp(after_changed_at), after_id
+
+
+async def _watermark(db: AsyncSession):
+    return (await db.execute(
+        text("SELECT LOCALTIMESTAMP - make_interval(secs => :overlap)"),
+        {"overlap": float(settings.SYNC_OVERLAP_SECONDS)},
+    )).scalar()
+
+
+async def fetch_changes(
+    db: AsyncSession,
+    columns: str,
+    from_clause: str,
+    alias: str,
+    token: str,
+    limit: int,
+) -> tuple[list, list, str, bool]:
+    """
+    Fetch one page of rows changed since a sync token.
+
+    A bootstrap token returns every live row and no tombstones, paged by id
+    (primary key order, so no sort over the table). Its final token is the
+    watermark taken when the bootstrap started, so rows changed while it ran
+    are delivered again by the first delta.
+
+    Delta pages are scanned in (change time, id) order, where change time is the
+    latest of created_at, updated_at and deleted_at. Live rows and tombstones
+    (rows whose deleted_at moved past the watermark) come back separately, with
+    the token for the next call and whether more pages follow.
+
+    Every write path stamps updated_at (or deleted_at), including the triggers
+    that touch rows whose joined names changed, so the delta filter can use the
+    indexes on those two columns. The final watermark trails the database clock
+    by SYNC_OVERLAP_SECONDS so rows committed late by slower transactions (or not
+    yet replayed on a replica) are still picked up; rows inside that window are
+    sent again, and clients apply them idempotently by id.
+    """
+    since, after_changed_at, after_id = parse_sync_token(token)
+    changed_at = f"GREATEST({alias}.created_at, {alias}.updated_at, {alias}.deleted_at)"
+    params = {"limit": limit + 1}
+    bootstrap = since is None or (after_changed_at is None and after_id is not None)
+
+    if bootstrap:
+        if since is None:
+            since = await _watermark(db)
+        where = f"{alias}.deleted_at IS NULL"
+        order = f"{alias}.id"
+        if after_id is not None:
+            where += f" AND {alias}.id > :after_id"
+            params["after_id"] = after_id
+    else:
+        where = f"({alias}.updated_at > :since OR {alias}.deleted_at > :since)"
+        order = f"changed_at, {alias}.id"
+        params["since"] = since
+        if after_id is not None:
+            where += f" AND ({changed_at}, {alias}.id) > (:after_changed_at, :after_id)"
+            params["after_changed_at"] = after_changed_at
+            params["after_id"] = after_id
+
+    query = f"""
+        SELECT
+            {columns},
+            {alias}.deleted_at,
+            {changed_at} as changed_at
+        {from_clause}
+        WHERE {where}
+        ORDER BY {order}
+        LIMIT :limit
+    """
+
+    rows = (await db.execute(text(query), params)).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    live = [row for row in rows if row.deleted_at is None]
+    deleted = [
+        {"id": row.id, "deletedAt": row.deleted_at.isoformat()}
+        for row in rows if row.deleted_at is not None
+    ]
+
+    if has_more:
+        last = rows[-1]
+        if bootstrap:
+            return live, deleted, encode_cursor(since.isoformat(), None, last.id), True
+        return live, deleted, encode_cursor(since.isoformat(), last.changed_at.isoformat(), last.id), True
+
+    if bootstrap:
+        return live, deleted, encode_cursor(since.isoformat(), None, None), False
+
+    watermark = await _watermark(db)
+    if since > watermark:
+        watermark = since
+    return live, deleted, encode_cursor(watermark.isoformat(), None, None), False
@@ -1,13 +1,38 @@
-
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..core.cache import TTLCache
+from ..core.config import settings
+
+# Per-worker cache of resolved principals, keyed by user id.
+# Holds detached User snapshots (not ORM rows) so entries survive session close.
+# Role changes and deletions reach other workers (and changes made directly in
+# the database reach any worker) only when the entry expires, so a stale
+# principal lives at most PRINCIPAL_CACHE_TTL_SECONDS.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
 
 def get_user_by_email(db: Session, email: str) -> models.user.UserDB:
     return db.query(models.user.UserDB).filter(models.user.UserDB.email == email).first()
 
-def get_user_by_id(db: Session, user_id: int) -> models.user.UserDB:
-    return db.query(models.user.UserDB).filter(models.user.UserDB.id == user_id).first()
+async def get_principal_async(db: AsyncSession, user_id: int) -> models.user.User | None:
+    """Resolve an active user for authentication, served from the principal cache when possible"""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(select(models.user.UserDB).where(models.user.UserDB.id == user_id))
+    user_obj = result.scalar_one_or_none()
+    if user_obj is None or user_obj.deleted_at is not None:
+        return None
+
+    principal = models.user.User.model_validate(user_obj)
+    principal_cache.set(user_id, principal)
+    return principal
 
 def create_user(db: Session, user_data: dict) -> models.user.UserDB:
     # **user_data unpacks the dictionary into keyword arguments
@@ -0,0 +1,53 @@
+import asyncio
+
+from backend.services.import_service import iter_records
+
+
+class StreamedBody:
+    """Stands in for a Request whose body arrives in the given chunks"""
+
+    def __init__(self, *chunks: bytes):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def collect(request, fmt="csv"):
+    async def run():
+        return [
+            (line_no, str(record) if isinstance(record, ValueError) else record)
+            async for line_no, record in iter_records(request, fmt)
+        ]
+    return asyncio.run(run())
+
+
+def test_quoted_field_with_newline_and_quote():
+    body = b'name,description\n"Press","Leaks ""badly""\nafter night shift"\nLathe,ok\n'
+    assert collect(StreamedBody(body)) == [
+        (2, {"name": "Press", "description": 'Leaks "badly"\nafter night shift'}),
+        (4, {"name": "Lathe", "description": "ok"}),
+    ]
+
+
+def test_multiline_record_split_across_chunks():
+    request = StreamedBody(b'name,serial_number\n"x\n', b'y",z\n', b"\nw,v")
+    assert collect(request) == [
+        (2, {"name": "x\ny", "serial_number": "z"}),
+        (5, {"name": "w", "serial_number": "v"}),
+    ]
+
+
+def test_unclosed_quote_is_reported_at_record_start():
+    request = StreamedBody(b'name,serial_number\na,b\n"c,d\ne,f\n')
+    assert collect(request) == [
+        (2, {"name": "a", "serial_number": "b"}),
+        (3, "has a quoted field that is never closed"),
+    ]
+
+
+def test_field_count_mismatch():
+    assert collect(StreamedBody(b"name,serial_number\nonly\n")) == [
+        (2, "has 1 fields, expected 2"),
+    ]
@@ -10,6 +10,7 @@ export const API_ENDPOINTS = {
     // Equipment
     EQUIPMENT: {
         LIST: '/api/equipment',
+        LOOKUP: '/api/equipment/lookup',
         DETAIL: (id: number) => `/api/equipment/${id}`,
         CREATE: '/api/equipment',
         UPDATE: (id: number) => `/api/equipment/${id}`,
@@ -30,6 +31,7 @@ export const API_ENDPOINTS = {
     // Maintenance Requests
     REQUESTS: {
         LIST: '/api/requests',
+        BOARD: '/api/requests/board',
         DETAIL: (id: number) => `/api/requests/${id}`,
         CREATE: '/api/requests',
         UPDATE: (id: number) => `/api/requests/${id}`,
@@ -52,4 +54,7 @@ export const API_ENDPOINTS = {
         EQUIPMENT_STATUS: '/api/reports/equipment-status',
         TECHNICIAN_WORKLOAD: '/api/reports/technician-workload',
     },
+
+    // Server-sent change events
+    EVENTS: '/api/events',
 } as const;
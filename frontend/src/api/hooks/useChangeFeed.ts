@@ -0,0 +1,45 @@
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import apiClient from '../client';
+import { API_ENDPOINTS } from '../endpoints';
+import { applyRequestChange } from '../requestCache';
+
+interface ChangeEvent {
+    entity: string;
+    action: string;
+    id?: number;
+    ids?: number[];
+}
+
+// ==================== Change Feed ====================
+// Subscribes to server-sent change events and updates only the cached rows they touch,
+// instead of every client polling full lists.
+export const useChangeFeed = () => {
+    const queryClient = useQueryClient();
+
+    useEffect(() => {
+        const source = new EventSource(`${apiClient.defaults.baseURL}${API_ENDPOINTS.EVENTS}`, {
+            withCredentials: true,
+        });
+
+        source.addEventListener('request', (message) => {
+            const event: ChangeEvent = JSON.parse((message as MessageEvent).data);
+            if (event.action !== 'commented') {
+                queryClient.invalidateQueries({ queryKey: ['dashboard'] });
+            }
+            applyRequestChange(queryClient, event);
+        });
+
+        // Events were lost (slow client or server reconnect): refetch everything,
+        // with paged lists starting over from their first page
+        source.addEventListener('feed', () => {
+            queryClient.resetQueries({ queryKey: ['requests', 'list'] });
+            queryClient.resetQueries({ queryKey: ['equipment', 'list'] });
+            queryClient.invalidateQueries({
+                predicate: (query) => query.queryKey[1] !== 'list',
+            });
+        });
+
+        return () => source.close();
+    }, [queryClient]);
+};
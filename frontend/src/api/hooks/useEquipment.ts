@@ -1,4 +1,4 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { keepPreviousData, useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import apiClient from '../client';
 import { API_ENDPOINTS } from '../endpoints';
 
@@ -25,18 +25,43 @@ interface EquipmentFilters {
     category?: string;
     department?: string;
     is_scrapped?: boolean;
+    q?: string;
 }
 
 // ==================== GET Equipment List ====================
+// One page per fetch; fetchNextPage follows nextCursor. The first page carries the
+// planner's estimate of the total, so the header can show it without a count.
 export const useEquipmentList = (filters?: EquipmentFilters) => {
-    return useQuery({
+    return useInfiniteQuery({
         queryKey: ['equipment', 'list', filters],
-        queryFn: async () => {
+        queryFn: async ({ pageParam }) => {
             const { data } = await apiClient.get(API_ENDPOINTS.EQUIPMENT.LIST, {
-                params: filters,
+                params: pageParam
+                    ? { ...filters, cursor: pageParam }
+                    : { ...filters, with_total: 'estimated' },
+            });
+            return data;
+        },
+        initialPageParam: null as string | null,
+        getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+        // Keep showing the current rows while a new search or filter loads
+        placeholderData: keepPreviousData,
+    });
+};
+
+// ==================== Equipment Lookup ====================
+// Autocomplete by name or serial number, for pickers
+export const useEquipmentLookup = (q: string, limit = 20) => {
+    return useQuery({
+        queryKey: ['equipment', 'lookup', q, limit],
+        queryFn: async () => {
+            const { data } = await apiClient.get(API_ENDPOINTS.EQUIPMENT.LOOKUP, {
+                params: { q, limit },
             });
             return data;
         },
+        enabled: q.length > 0,
+        placeholderData: keepPreviousData,
     });
 };
 
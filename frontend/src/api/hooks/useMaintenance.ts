@@ -1,6 +1,7 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import apiClient from '../client';
 import { API_ENDPOINTS } from '../endpoints';
+import { applyRequestChange } from '../requestCache';
 
 // Types
 interface MaintenanceRequest {
@@ -37,6 +38,9 @@ interface Comment {
     createdAt?: string;
 }
 
+// Cards fetched per board column and per "load more"
+const BOARD_PAGE_SIZE = 20;
+
 interface RequestFilters {
     status?: string;
     request_type?: string;
@@ -45,15 +49,59 @@ interface RequestFilters {
 }
 
 // ==================== GET Requests List ====================
-export const useMaintenanceRequests = (filters?: RequestFilters) => {
-    return useQuery({
+// One page per fetch; fetchNextPage follows nextCursor. The first page carries the
+// planner's estimate of the total, so the header can show it without a count.
+export const useMaintenanceRequests = (filters?: RequestFilters, enabled = true) => {
+    return useInfiniteQuery({
         queryKey: ['requests', 'list', filters],
+        queryFn: async ({ pageParam }) => {
+            const { data } = await apiClient.get(API_ENDPOINTS.REQUESTS.LIST, {
+                params: pageParam
+                    ? { ...filters, cursor: pageParam }
+                    : { ...filters, with_total: 'estimated' },
+            });
+            return data;
+        },
+        initialPageParam: null as string | null,
+        getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+        enabled,
+    });
+};
+
+// ==================== GET Request Board ====================
+// The Kanban board: per status column its newest cards, total and nextCursor
+export const useRequestBoard = (filters?: Omit<RequestFilters, 'status'>, enabled = true) => {
+    return useQuery({
+        queryKey: ['requests', 'board', filters],
         queryFn: async () => {
+            const { data } = await apiClient.get(API_ENDPOINTS.REQUESTS.BOARD, {
+                params: { ...filters, per_column: BOARD_PAGE_SIZE },
+            });
+            return data;
+        },
+        enabled,
+    });
+};
+
+// Appends the next page of one board column to the cached board
+export const useLoadBoardColumn = (filters?: Omit<RequestFilters, 'status'>) => {
+    const queryClient = useQueryClient();
+
+    return useMutation({
+        mutationFn: async ({ status, cursor }: { status: string; cursor: string }) => {
             const { data } = await apiClient.get(API_ENDPOINTS.REQUESTS.LIST, {
-                params: filters,
+                params: { ...filters, status, cursor, limit: BOARD_PAGE_SIZE },
             });
             return data;
         },
+        onSuccess: (page, { status }) => {
+            queryClient.setQueryData(['requests', 'board', filters], (board: any) => board && {
+                ...board,
+                columns: board.columns.map((column: any) => column.status === status
+                    ? { ...column, requests: [...column.requests, ...page.requests], nextCursor: page.nextCursor }
+                    : column),
+            });
+        },
     });
 };
 
@@ -91,8 +139,8 @@ export const useCreateRequest = () => {
             );
             return data;
         },
-        onSuccess: () => {
-            queryClient.invalidateQueries({ queryKey: ['requests', 'list'] });
+        onSuccess: (data) => {
+            applyRequestChange(queryClient, { action: 'created', id: data.id });
             queryClient.invalidateQueries({ queryKey: ['dashboard'] });
         },
     });
@@ -111,8 +159,7 @@ export const useUpdateRequest = () => {
             return data;
         },
         onSuccess: (_, variables) => {
-            queryClient.invalidateQueries({ queryKey: ['requests', variables.id] });
-            queryClient.invalidateQueries({ queryKey: ['requests', 'list'] });
+            applyRequestChange(queryClient, { action: 'updated', id: variables.id });
         },
     });
 };
@@ -131,8 +178,7 @@ export const useUpdateRequestStatus = () => {
             return data;
         },
         onSuccess: (_, variables) => {
-            queryClient.invalidateQueries({ queryKey: ['requests', variables.id] });
-            queryClient.invalidateQueries({ queryKey: ['requests', 'list'] });
+            applyRequestChange(queryClient, { action: 'status_changed', id: variables.id });
             queryClient.invalidateQueries({ queryKey: ['dashboard'] });
         },
     });
@@ -169,8 +215,8 @@ export const useDeleteRequest = () => {
             const { data } = await apiClient.delete(API_ENDPOINTS.REQUESTS.DELETE(id));
             return data;
         },
-        onSuccess: () => {
-            queryClient.invalidateQueries({ queryKey: ['requests', 'list'] });
+        onSuccess: (_, id) => {
+            applyRequestChange(queryClient, { action: 'deleted', id });
             queryClient.invalidateQueries({ queryKey: ['dashboard'] });
         },
     });
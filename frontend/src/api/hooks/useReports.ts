@@ -10,7 +10,8 @@ export const useDashboardStats = () => {
             const { data } = await apiClient.get(API_ENDPOINTS.DASHBOARD.STATS);
             return data;
         },
-        refetchInterval: 30000, // Refetch every 30 seconds for real-time updates
+        // Kept fresh by useChangeFeed; the slow poll only covers a dropped event stream
+        refetchInterval: 5 * 60 * 1000,
     });
 };
 
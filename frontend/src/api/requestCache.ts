@@ -0,0 +1,157 @@
+import { InfiniteData, QueryClient } from '@tanstack/react-query';
+import apiClient from './client';
+import { API_ENDPOINTS } from './endpoints';
+
+export interface RequestChange {
+    action: string;
+    id?: number;
+    ids?: number[];
+}
+
+// Changes touching more requests than this (or with no ids, like imports) refetch
+// the first list page and the board instead of fetching each request
+const MAX_PATCHED_IDS = 20;
+
+interface ListPage {
+    requests: any[];
+    total?: number | null;
+    nextCursor?: string | null;
+}
+
+interface Board {
+    columns: { status: string; total: number; requests: any[]; nextCursor?: string | null }[];
+}
+
+// List and board order: newest first, ties by id
+const sortsBefore = (a: any, b: any) =>
+    a.createdAt > b.createdAt || (a.createdAt === b.createdAt && a.id > b.id);
+
+// Whether a request belongs in a list fetched with these filters
+const matchesFilters = (request: any, filters?: Record<string, any>) =>
+    (!filters?.status || request.status === filters.status) &&
+    (!filters?.request_type || request.requestType === filters.request_type) &&
+    (!filters?.equipment_id || request.equipmentId === filters.equipment_id) &&
+    (!filters?.team_id || request.maintenanceTeamId === filters.team_id);
+
+// Inserts a row at its place among the loaded rows; a row that sorts after them
+// is left for the page that will contain it
+const insertSorted = (rows: any[], row: any, hasMore: boolean) => {
+    const position = rows.findIndex((other) => sortsBefore(row, other));
+    if (position === -1) return hasMore ? rows : [...rows, row];
+    return [...rows.slice(0, position), row, ...rows.slice(position)];
+};
+
+const patchList = (data: InfiniteData<ListPage>, filters: any, id: number, row: any | null) => {
+    const keep = row !== null && matchesFilters(row, filters);
+    const found = data.pages.some((page) => page.requests.some((request) => request.id === id));
+    const pages = data.pages.map((page) => ({
+        ...page,
+        requests: page.requests.flatMap((request) =>
+            request.id !== id ? [request] : keep ? [{ ...request, ...row }] : []),
+    }));
+    if (!found && keep) {
+        // The first page holding a row that sorts after it, else the last page
+        const last = pages.length - 1;
+        const index = pages.findIndex((page, i) =>
+            i === last || page.requests.some((request) => sortsBefore(row, request)));
+        pages[index] = {
+            ...pages[index],
+            requests: insertSorted(pages[index].requests, row, !!pages[index].nextCursor),
+        };
+    }
+    return { ...data, pages };
+};
+
+// Moves a card between columns and adjusts their totals. Returns undefined when
+// the card's previous column is unknown, so the totals cannot be patched.
+const patchBoard = (board: Board, id: number, row: any | null, created: boolean) => {
+    const from = board.columns.find((column) => column.requests.some((request) => request.id === id));
+    if (!from && !created) return undefined;
+
+    return {
+        ...board,
+        columns: board.columns.map((column) => {
+            let { requests, total } = column;
+            if (column === from) {
+                requests = requests.filter((request) => request.id !== id);
+                total -= 1;
+            }
+            if (row !== null && column.status === row.status) {
+                const previous = from?.requests.find((request) => request.id === id);
+                requests = insertSorted(requests, { ...previous, ...row }, !!column.nextCursor);
+                total += 1;
+            }
+            return { ...column, requests, total };
+        }),
+    };
+};
+
+// The request as a list row: the detail without its history and comments
+const fetchRow = async (id: number) => {
+    try {
+        const { data } = await apiClient.get(API_ENDPOINTS.REQUESTS.DETAIL(id), {
+            params: { comments_limit: 0 },
+        });
+        const { statusHistory, comments, ...row } = data;
+        return row;
+    } catch (error: any) {
+        if (error.response?.status === 404) return null;
+        throw error;
+    }
+};
+
+// ==================== Request Cache ====================
+// Applies a change to the cached request lists and board: fetches each changed
+// request and patches, moves or removes its row in place, so a change never
+// refetches every loaded page. Detail views of the requests are refetched.
+export const applyRequestChange = async (queryClient: QueryClient, change: RequestChange) => {
+    const ids = change.ids ?? (change.id !== undefined ? [change.id] : []);
+
+    for (const id of ids) {
+        if (change.action === 'deleted') {
+            queryClient.removeQueries({ queryKey: ['requests', id] });
+        } else {
+            queryClient.invalidateQueries({ queryKey: ['requests', id] });
+        }
+    }
+    if (change.action === 'commented') return;
+
+    // Back to the first list page and a fresh board
+    const refetchFirstPages = () => {
+        queryClient.resetQueries({ queryKey: ['requests', 'list'] });
+        queryClient.invalidateQueries({ queryKey: ['requests', 'board'] });
+    };
+
+    if (ids.length === 0 || ids.length > MAX_PATCHED_IDS) {
+        refetchFirstPages();
+        return;
+    }
+
+    let rows: (any | null)[];
+    try {
+        rows = change.action === 'deleted'
+            ? ids.map(() => null)
+            : await Promise.all(ids.map(fetchRow));
+    } catch (error) {
+        console.error('Could not fetch changed requests:', error);
+        refetchFirstPages();
+        return;
+    }
+
+    ids.forEach((id, i) => {
+        const row = rows[i];
+        for (const [queryKey, data] of queryClient.getQueriesData<InfiniteData<ListPage>>({ queryKey: ['requests', 'list'] })) {
+            if (data) queryClient.setQueryData(queryKey, patchList(data, queryKey[2], id, row));
+        }
+        for (const [queryKey, board] of queryClient.getQueriesData<Board>({ queryKey: ['requests', 'board'] })) {
+            if (!board) continue;
+            const shown = row !== null && matchesFilters(row, queryKey[2] as any) ? row : null;
+            const patched = patchBoard(board, id, shown, change.action === 'created');
+            if (patched === undefined) {
+                queryClient.invalidateQueries({ queryKey, exact: true });
+            } else {
+                queryClient.setQueryData(queryKey, patched);
+            }
+        }
+    });
+};
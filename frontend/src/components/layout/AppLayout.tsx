@@ -1,7 +1,10 @@
 import { Outlet } from 'react-router-dom';
 import { TopBar } from './TopBar';
+import { useChangeFeed } from '@/api/hooks/useChangeFeed';
 
 export function AppLayout() {
+  useChangeFeed();
+
   return (
     <div className="flex min-h-screen w-full flex-col bg-background">
       <TopBar />
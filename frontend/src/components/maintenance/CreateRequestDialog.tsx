@@ -19,9 +19,10 @@ import {
 } from '@/components/ui/select';
 import { useToast } from '@/components/ui/use-toast';
 import { Loader2 } from 'lucide-react';
-import { useEquipmentList } from '@/api/hooks/useEquipment';
+import { useEquipment, useEquipmentLookup } from '@/api/hooks/useEquipment';
 import { useTeamsList } from '@/api/hooks/useTeams';
 import { useCreateRequest } from '@/api/hooks/useMaintenance';
+import { useDebouncedValue } from '@/hooks/use-debounced-value';
 
 interface CreateRequestDialogProps {
   open: boolean;
@@ -31,12 +32,9 @@ interface CreateRequestDialogProps {
 export function CreateRequestDialog({ open, onOpenChange }: CreateRequestDialogProps) {
   const { toast } = useToast();
 
-  // Fetch equipment and teams from API
-  const { data: equipmentData } = useEquipmentList();
   const { data: teamsData } = useTeamsList();
   const createRequestMutation = useCreateRequest();
 
-  const equipment = equipmentData?.equipment || [];
   const teams = teamsData?.teams || [];
 
   // Mock Work Centers (not in database yet)
@@ -59,11 +57,22 @@ export function CreateRequestDialog({ open, onOpenChange }: CreateRequestDialogP
     priority: 'medium' as 'low' | 'medium' | 'high',
   });
 
+  // Equipment options come from the lookup endpoint as the user types; the
+  // selected item is fetched on its own so it stays listed and fills team/technician
+  const [equipmentSearch, setEquipmentSearch] = useState('');
+  const lookupQuery = useDebouncedValue(equipmentSearch.trim());
+  const { data: lookupData } = useEquipmentLookup(lookupQuery);
+  const { data: selectedEquipment } = useEquipment(parseInt(formData.equipmentId) || 0);
+
+  const equipmentOptions = (lookupData?.results || []).filter((e: any) => !e.isScrapped);
+  if (selectedEquipment && !equipmentOptions.some((e: any) => e.id === selectedEquipment.id)) {
+    equipmentOptions.unshift(selectedEquipment);
+  }
+
   // Auto-fill when equipment is selected
   useEffect(() => {
     if (formData.maintenanceFor === 'equipment' && formData.equipmentId) {
-      const selectedEquipment = equipment.find((e: any) => e.id === parseInt(formData.equipmentId));
-      if (selectedEquipment?.maintenanceTeamId) {
+      if (selectedEquipment?.id === parseInt(formData.equipmentId) && selectedEquipment.maintenanceTeamId) {
         setFormData((prev) => ({
           ...prev,
           teamId: selectedEquipment.maintenanceTeamId.toString(),
@@ -71,7 +80,7 @@ export function CreateRequestDialog({ open, onOpenChange }: CreateRequestDialogP
         }));
       }
     }
-  }, [formData.equipmentId, formData.maintenanceFor, equipment]);
+  }, [formData.equipmentId, formData.maintenanceFor, selectedEquipment]);
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -118,6 +127,7 @@ export function CreateRequestDialog({ open, onOpenChange }: CreateRequestDialogP
         description: '',
         priority: 'medium',
       });
+      setEquipmentSearch('');
 
       onOpenChange(false);
     } catch (error: any) {
@@ -196,23 +206,28 @@ export function CreateRequestDialog({ open, onOpenChange }: CreateRequestDialogP
 
             <div className="col-span-12 md:col-span-8">
               {formData.maintenanceFor === 'equipment' ? (
-                <Select
-                  value={formData.equipmentId}
-                  onValueChange={(v) => setFormData({ ...formData, equipmentId: v })}
-                >
-                  <SelectTrigger>
-                    <SelectValue placeholder="Select Equipment..." />
-                  </SelectTrigger>
-                  <SelectContent>
-                    {equipment
-                      .filter((e: any) => !e.isScrapped)
-                      .map((eq: any) => (
+                <div className="flex flex-col gap-2">
+                  <Input
+                    placeholder="Search equipment by name or serial..."
+                    value={equipmentSearch}
+                    onChange={(e) => setEquipmentSearch(e.target.value)}
+                  />
+                  <Select
+                    value={formData.equipmentId}
+                    onValueChange={(v) => setFormData({ ...formData, equipmentId: v })}
+                  >
+                    <SelectTrigger>
+                      <SelectValue placeholder="Select Equipment..." />
+                    </SelectTrigger>
+                    <SelectContent>
+                      {equipmentOptions.map((eq: any) => (
                         <SelectItem key={eq.id} value={eq.id.toString()}>
                           {eq.name} ({eq.serialNumber})
                         </SelectItem>
                       ))}
-                  </SelectContent>
-                </Select>
+                    </SelectContent>
+                  </Select>
+                </div>
               ) : (
                 <Select
                   value={formData.workCenterId}
@@ -6,6 +6,7 @@ import { cn } from '@/lib/utils';
 import { useState } from 'react';
 import { useUpdateRequestStatus } from '@/api/hooks/useMaintenance';
 import { useToast } from '@/components/ui/use-toast';
+import { Button } from '@/components/ui/button';
 import {
   AlertDialog,
   AlertDialogAction,
@@ -17,8 +18,17 @@ import {
   AlertDialogTitle,
 } from '@/components/ui/alert-dialog';
 
-interface KanbanBoardProps {
+interface BoardColumn {
+  status: string;
+  total: number;
   requests: any[];
+  nextCursor?: string | null;
+}
+
+interface KanbanBoardProps {
+  columns: BoardColumn[];
+  loadingStatus?: string;
+  onLoadMore: (status: string, cursor: string) => void;
 }
 
 const columns = [
@@ -28,7 +38,7 @@ const columns = [
   { id: 'scrap', title: 'Scrap', color: 'border-t-red-500' },
 ];
 
-export function KanbanBoard({ requests }: KanbanBoardProps) {
+export function KanbanBoard({ columns: boardColumns, loadingStatus, onLoadMore }: KanbanBoardProps) {
   const { toast } = useToast();
   const updateStatusMutation = useUpdateRequestStatus();
 
@@ -37,9 +47,8 @@ export function KanbanBoard({ requests }: KanbanBoardProps) {
     requestId: null,
   });
 
-  const getRequestsByStatus = (status: string) => {
-    return requests.filter((r: any) => r.status === status);
-  };
+  const getColumn = (status: string): BoardColumn =>
+    boardColumns.find((column) => column.status === status) ?? { status, total: 0, requests: [] };
 
   const handleDragEnd = (result: DropResult) => {
     if (!result.destination) return;
@@ -105,7 +114,7 @@ export function KanbanBoard({ requests }: KanbanBoardProps) {
               <div className="flex items-center justify-between mb-4">
                 <h3 className="font-semibold text-foreground">{column.title}</h3>
                 <span className="px-2 py-0.5 rounded-full bg-muted text-muted-foreground text-xs font-medium">
-                  {getRequestsByStatus(column.id).length}
+                  {getColumn(column.id).total}
                 </span>
               </div>
 
@@ -119,7 +128,7 @@ export function KanbanBoard({ requests }: KanbanBoardProps) {
                       snapshot.isDraggingOver && 'bg-primary/5'
                     )}
                   >
-                    {getRequestsByStatus(column.id).map((request: any, index: number) => (
+                    {getColumn(column.id).requests.map((request: any, index: number) => (
                       <Draggable key={request.id} draggableId={request.id.toString()} index={index}>
                         {(provided, snapshot) => (
                           <div
@@ -209,6 +218,18 @@ export function KanbanBoard({ requests }: KanbanBoardProps) {
                   </div>
                 )}
               </Droppable>
+
+              {getColumn(column.id).nextCursor && (
+                <Button
+                  variant="ghost"
+                  size="sm"
+                  className="w-full mt-3"
+                  disabled={loadingStatus === column.id}
+                  onClick={() => onLoadMore(column.id, getColumn(column.id).nextCursor!)}
+                >
+                  {loadingStatus === column.id ? 'Loading...' : 'Load more'}
+                </Button>
+              )}
             </div>
           ))}
         </div>
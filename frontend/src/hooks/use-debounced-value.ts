@@ -0,0 +1,12 @@
+import * as React from "react";
+
+export function useDebouncedValue<T>(value: T, delay = 250) {
+  const [debounced, setDebounced] = React.useState(value);
+
+  React.useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delay);
+    return () => clearTimeout(timer);
+  }, [value, delay]);
+
+  return debounced;
+}
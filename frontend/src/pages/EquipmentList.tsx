@@ -1,6 +1,7 @@
 import { useState } from 'react';
 import { Link } from 'react-router-dom';
 import { Search, Filter, Cog, MapPin, Users, AlertTriangle, Loader2 } from 'lucide-react';
+import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { CreateEquipmentDialog } from '@/components/equipment/CreateEquipmentDialog';
 import {
@@ -21,14 +22,19 @@ import {
 import { UserAvatar } from '@/components/common/UserAvatar';
 import { cn } from '@/lib/utils';
 import { useEquipmentList } from '@/api/hooks/useEquipment';
+import { useDebouncedValue } from '@/hooks/use-debounced-value';
 
 export default function EquipmentList() {
   const [searchQuery, setSearchQuery] = useState('');
   const [departmentFilter, setDepartmentFilter] = useState('all');
   const [groupBy, setGroupBy] = useState<'none' | 'department' | 'employee'>('none');
 
-  // Fetch equipment from API
-  const { data, isLoading, error } = useEquipmentList();
+  // Search and department filter run on the server, one page at a time
+  const search = useDebouncedValue(searchQuery.trim());
+  const { data, isLoading, error, hasNextPage, fetchNextPage, isFetchingNextPage } = useEquipmentList({
+    q: search || undefined,
+    department: departmentFilter === 'all' ? undefined : departmentFilter,
+  });
 
   if (isLoading) {
     return (
@@ -46,18 +52,16 @@ export default function EquipmentList() {
     );
   }
 
-  const equipment = data?.equipment || [];
-
-  // Extract unique departments from equipment
-  const departments = [...new Set(equipment.map((e: any) => e.department).filter(Boolean))];
+  const filteredEquipment = data?.pages.flatMap((page) => page.equipment) || [];
+  const total = data?.pages[0]?.total;
 
-  const filteredEquipment = equipment.filter((eq: any) => {
-    const matchesSearch =
-      eq.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      eq.serialNumber.toLowerCase().includes(searchQuery.toLowerCase());
-    const matchesDepartment = departmentFilter === 'all' || eq.department === departmentFilter;
-    return matchesSearch && matchesDepartment;
-  });
+  // Departments seen in the loaded pages, plus the selected one
+  const departments = [
+    ...new Set(
+      [...filteredEquipment.map((e: any) => e.department), departmentFilter === 'all' ? null : departmentFilter]
+        .filter(Boolean)
+    ),
+  ];
 
   const groupedEquipment = () => {
     if (groupBy === 'none') return { 'All Equipment': filteredEquipment };
@@ -89,7 +93,8 @@ export default function EquipmentList() {
         <div>
           <h1 className="text-2xl font-bold text-foreground">Equipment</h1>
           <p className="text-muted-foreground mt-1">
-            Manage and track all your equipment assets ({equipment.length} total)
+            Manage and track all your equipment assets
+            {total != null && ` (about ${total} total)`}
           </p>
         </div>
         <CreateEquipmentDialog />
@@ -254,6 +259,14 @@ export default function EquipmentList() {
           </Table>
         </div>
       ))}
+
+      {hasNextPage && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+            {isFetchingNextPage ? 'Loading...' : 'Load more'}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
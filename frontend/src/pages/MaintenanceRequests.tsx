@@ -5,7 +5,7 @@ import { KanbanBoard } from '@/components/maintenance/KanbanBoard';
 import { RequestList } from '@/components/maintenance/RequestList';
 import { CreateRequestDialog } from '@/components/maintenance/CreateRequestDialog';
 import { cn } from '@/lib/utils';
-import { useMaintenanceRequests } from '@/api/hooks/useMaintenance';
+import { useLoadBoardColumn, useMaintenanceRequests, useRequestBoard } from '@/api/hooks/useMaintenance';
 
 type ViewMode = 'kanban' | 'list';
 
@@ -13,8 +13,11 @@ export default function MaintenanceRequests() {
   const [viewMode, setViewMode] = useState<ViewMode>('list');
   const [createDialogOpen, setCreateDialogOpen] = useState(false);
 
-  // Fetch maintenance requests from API
-  const { data, isLoading, error } = useMaintenanceRequests();
+  // The list pages through requests; the board loads its own columns
+  const list = useMaintenanceRequests(undefined, viewMode === 'list');
+  const board = useRequestBoard(undefined, viewMode === 'kanban');
+  const loadColumn = useLoadBoardColumn();
+  const { isLoading, error } = viewMode === 'list' ? list : board;
 
   if (isLoading) {
     return (
@@ -32,7 +35,11 @@ export default function MaintenanceRequests() {
     );
   }
 
-  const requests = data?.requests || [];
+  const requests = list.data?.pages.flatMap((page) => page.requests) || [];
+  const columns = board.data?.columns || [];
+  const total = viewMode === 'list'
+    ? list.data?.pages[0]?.total
+    : columns.reduce((sum: number, column: any) => sum + column.total, 0);
 
   return (
     <div className="space-y-6 animate-fade-in">
@@ -41,7 +48,8 @@ export default function MaintenanceRequests() {
         <div>
           <h1 className="text-2xl font-bold text-foreground">Maintenance Requests</h1>
           <p className="text-muted-foreground mt-1">
-            Track and manage all maintenance work orders ({requests.length} total)
+            Track and manage all maintenance work orders
+            {total != null && ` (${viewMode === 'list' ? 'about ' : ''}${total} total)`}
           </p>
         </div>
         <div className="flex items-center gap-3">
@@ -79,9 +87,26 @@ export default function MaintenanceRequests() {
 
       {/* Content */}
       {viewMode === 'kanban' ? (
-        <KanbanBoard requests={requests} />
+        <KanbanBoard
+          columns={columns}
+          loadingStatus={loadColumn.isPending ? loadColumn.variables?.status : undefined}
+          onLoadMore={(status, cursor) => loadColumn.mutate({ status, cursor })}
+        />
       ) : (
-        <RequestList requests={requests} />
+        <div className="space-y-4">
+          <RequestList requests={requests} />
+          {list.hasNextPage && (
+            <div className="flex justify-center">
+              <Button
+                variant="outline"
+                onClick={() => list.fetchNextPage()}
+                disabled={list.isFetchingNextPage}
+              >
+                {list.isFetchingNextPage ? 'Loading...' : 'Load more'}
+              </Button>
+            </div>
+          )}
+        </div>
       )}
 
       {/* Create Dialog */}